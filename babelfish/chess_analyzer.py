@@ -1,22 +1,40 @@
 """Chess analysis module using Stockfish via MCP."""
 
+from collections import OrderedDict
 from stockfish import Stockfish
 from typing import Dict, List, Optional
 import chess
 import chess.pgn
+import chess.polyglot
 import os
 import math
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 
 class ChessAnalyzer:
     """Chess analyzer that provides context-rich analysis using Stockfish."""
 
-    def __init__(self, stockfish_path: Optional[str] = None, verbose: bool = False):
+    # Intermediate depths searched by analyze_position_iterative
+    ITERATIVE_DEPTHS = (10, 14, 18)
+
+    def __init__(
+        self,
+        stockfish_path: Optional[str] = None,
+        verbose: bool = False,
+        cache_size: int = 4096,
+        pool_size: Optional[int] = None,
+    ):
         """Initialize the chess analyzer.
 
         Args:
             stockfish_path: Path to stockfish binary. If None, uses system stockfish.
             verbose: Whether to print configuration details.
+            cache_size: Maximum number of position analyses kept in the cache.
+            pool_size: Number of worker engines for batch analysis. Defaults
+                to the engine thread count.
         """
         # Calculate optimal thread count: floor(2/3 * num_cores)
         num_cores = os.cpu_count() or 1
@@ -30,10 +48,8 @@ class ChessAnalyzer:
             "Minimum Thinking Time": 10,  # Minimum time per move in ms
         }
 
-        if stockfish_path:
-            self.stockfish = Stockfish(path=stockfish_path, parameters=stockfish_params)
-        else:
-            self.stockfish = Stockfish(parameters=stockfish_params)
+        self._stockfish_path = stockfish_path
+        self.stockfish = self._create_engine(stockfish_params)
 
         if verbose:
             hash_mb = stockfish_params["Hash"]
@@ -48,9 +64,32 @@ class ChessAnalyzer:
             "total_cores": num_cores,
         }
 
-        # Cache for position analysis to avoid redundant calculations
-        self._current_fen = None
-        self._current_analysis = None
+        # The main engine runs for the analyzer's lifetime and is never sent
+        # ucinewgame, so its hash table stays warm across calls. The lock
+        # serializes access when the analyzer is used from several threads.
+        self._engine_lock = threading.Lock()
+
+        # LRU cache of position analyses keyed by (Zobrist hash, depth, time
+        # limit, MultiPV). The hash ignores move counters so transpositions share an
+        # entry, and is cheaper to build and compare than an EPD string.
+        self.cache_size = cache_size
+        self._analysis_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # Deepest cached depth-limited analysis by (Zobrist hash, MultiPV), so
+        # a request for a shallower depth can reuse a deeper search
+        self._deepest_depths: Dict[tuple, int] = {}
+
+        # Single-threaded worker engines for analyze_many, started on first
+        # use so one-off analyses don't pay for extra processes
+        self.pool_size = pool_size or optimal_threads
+        self._worker_params = {
+            **stockfish_params,
+            "Threads": 1,
+            "Hash": 64,
+        }
+        self._workers: "Optional[queue.Queue[Stockfish]]" = None
+        self._pool_lock = threading.Lock()
 
     def uci_to_san(self, fen: str, uci_move: str) -> str:
         """Convert UCI move to Standard Algebraic Notation.
@@ -64,12 +103,20 @@ class ChessAnalyzer:
         """
         try:
             board = chess.Board(fen)
+        except ValueError:
+            return uci_move  # Return UCI if conversion fails
+        return self._board_to_san(board, uci_move)
+
+    @staticmethod
+    def _board_to_san(board: chess.Board, uci_move: str) -> str:
+        """Convert a UCI move to SAN on an already parsed board."""
+        try:
             move = chess.Move.from_uci(uci_move)
-            if move in board.legal_moves:
+            if board.is_legal(move):
                 return board.san(move)
             else:
                 return uci_move  # Return UCI if conversion fails
-        except:
+        except ValueError:
             return uci_move  # Return UCI if conversion fails
 
     def san_to_uci(self, fen: str, san_move: str) -> str:
@@ -86,7 +133,7 @@ class ChessAnalyzer:
             board = chess.Board(fen)
             move = board.parse_san(san_move)
             return move.uci()
-        except:
+        except ValueError:
             return san_move  # Return original if conversion fails
 
     def convert_san_moves_to_uci(self, moves: List[str]) -> List[str]:
@@ -106,7 +153,7 @@ class ChessAnalyzer:
                 move = board.parse_san(san_move)
                 uci_moves.append(move.uci())
                 board.push(move)
-            except:
+            except ValueError:
                 # If conversion fails, try to use the move as-is
                 uci_moves.append(san_move)
                 break
@@ -114,33 +161,208 @@ class ChessAnalyzer:
         return uci_moves
 
     def analyze_position(
-        self, fen: str, depth: int = 15, time_limit: Optional[float] = None
+        self,
+        fen: str,
+        depth: int = 15,
+        time_limit: Optional[float] = None,
+        include_moves: Optional[List[str]] = None,
+        board: Optional[chess.Board] = None,
+        multipv: int = 3,
     ) -> Dict:
         """Analyze a chess position given in FEN notation.
 
-        Uses caching to avoid redundant analysis of the same position.
+        Results are cached, so repeated or transposed positions analyzed with
+        the same parameters do not hit the engine again. Without a time limit,
+        a cached search of the position at a greater depth is reused as well.
 
         Args:
             fen: The position in FEN notation
             depth: Analysis depth (default 15)
             time_limit: Maximum time in seconds for analysis (optional)
+            include_moves: Moves in SAN that must appear in top_moves. Moves the
+                engine did not rank are evaluated separately (optional)
+            board: The position already parsed from fen, to avoid parsing it
+                again (optional)
+            multipv: Number of engine lines to return in top_moves (default 3)
 
         Returns:
             Dictionary containing position analysis
         """
-        if not self.stockfish.is_fen_valid(fen):
-            raise ValueError(f"Invalid FEN: {fen}")
+        if board is None:
+            board = self._parse_fen(fen)
+        cache_key = self._cache_key(board, depth, time_limit, multipv)
+        if time_limit is None:
+            analysis = self._cache_get_at_least(cache_key)
+        else:
+            analysis = self._cache_get(cache_key)
+
+        if analysis is None:
+            with self._engine_lock:
+                analysis = self._search(
+                    self.stockfish,
+                    fen,
+                    depth,
+                    time_limit,
+                    board=board,
+                    multipv=multipv,
+                )
+
+            # Cache the analysis result
+            self._cache_put(cache_key, analysis)
+
+        analysis = {**analysis, "fen": fen}
+
+        if include_moves:
+            ranked = {move_info["Move"] for move_info in analysis["top_moves"]}
+            extra_moves = []
+            for san_move in include_moves:
+                move = board.parse_san(san_move)
+                if board.san(move) not in ranked:
+                    extra_moves.append(self._evaluate_move(board, move, depth))
+            analysis["top_moves"] = analysis["top_moves"] + extra_moves
+
+        return analysis
+
+    def _evaluate_move(self, board: chess.Board, move: chess.Move, depth: int) -> Dict:
+        """Evaluate a single move the engine did not rank among its top moves.
 
-        # Check if we've already analyzed this position with same parameters
-        cache_key = f"{fen}_{depth}_{time_limit}"
-        if (
-            self._current_fen == fen
-            and self._current_analysis is not None
-            and self._current_analysis.get("cache_key") == cache_key
-        ):
-            return self._current_analysis
+        Searches the position after the move one ply shallower, which matches
+        a root search restricted to that move. The hash table is kept, so the
+        preceding search of the parent position is reused.
 
-        self.stockfish.set_fen_position(fen)
+        Args:
+            board: The position before the move
+            move: The move to evaluate
+            depth: Depth the parent position was analyzed at
+
+        Returns:
+            Top-move style dictionary for the move
+        """
+        cache_key = self._cache_key(board, depth) + (move.uci(),)
+        move_info = self._cache_get(cache_key)
+        if move_info is not None:
+            return move_info
+
+        after_board = board.copy(stack=False)
+        after_board.push(move)
+        after_fen = after_board.fen()
+
+        with self._engine_lock:
+            self.stockfish.set_fen_position(after_fen, send_ucinewgame_token=False)
+            self.stockfish.set_depth(max(1, depth - 1))
+            evaluation = self.stockfish.get_evaluation()
+
+        move_info = {
+            "Move": board.san(move),
+            "UCI": move.uci(),
+            "Centipawn": evaluation["value"] if evaluation["type"] == "cp" else None,
+            "Mate": evaluation["value"] if evaluation["type"] == "mate" else None,
+        }
+        self._cache_put(cache_key, move_info)
+        return move_info
+
+    def analyze_many(
+        self,
+        fens: List[str],
+        depth: int = 15,
+        boards: Optional[List[chess.Board]] = None,
+        multipv: int = 3,
+    ) -> List[Dict]:
+        """Analyze several independent positions in parallel.
+
+        Cached positions are served from the cache; the remaining unique
+        positions are searched concurrently on a pool of worker engines.
+
+        Args:
+            fens: Positions in FEN notation
+            depth: Analysis depth for every position
+            boards: The positions already parsed from fens (optional)
+            multipv: Number of engine lines to return in top_moves (default 3)
+
+        Returns:
+            List of analyses in the same order as fens
+        """
+        if boards is None:
+            boards = [self._parse_fen(fen) for fen in fens]
+        keys = [self._cache_key(board, depth, multipv=multipv) for board in boards]
+
+        results = {}
+        pending = {}
+        for fen, board, key in zip(fens, boards, keys):
+            if key in results or key in pending:
+                continue
+            cached = self._cache_get_at_least(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending[key] = (fen, board)
+
+        if pending:
+            workers = self._worker_pool()
+
+            def search(position: tuple) -> Dict:
+                fen, board = position
+                engine = workers.get()
+                try:
+                    return self._search(
+                        engine, fen, depth, board=board, multipv=multipv
+                    )
+                finally:
+                    workers.put(engine)
+
+            with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+                searched = executor.map(search, pending.values())
+                for key, analysis in zip(pending, searched):
+                    self._cache_put(key, analysis)
+                    results[key] = analysis
+
+        return [{**results[key], "fen": fen} for fen, key in zip(fens, keys)]
+
+    def _worker_pool(self) -> "queue.Queue[Stockfish]":
+        """Get the pool of worker engines, starting them on first use."""
+        with self._pool_lock:
+            if self._workers is None:
+                workers = queue.Queue()
+                for _ in range(self.pool_size):
+                    workers.put(self._create_engine(self._worker_params))
+                self._workers = workers
+        return self._workers
+
+    def _create_engine(self, parameters: Dict) -> Stockfish:
+        """Start a Stockfish process with the given UCI options."""
+        if self._stockfish_path:
+            return Stockfish(path=self._stockfish_path, parameters=parameters)
+        return Stockfish(parameters=parameters)
+
+    def _search(
+        self,
+        engine: Stockfish,
+        fen: str,
+        depth: int,
+        time_limit: Optional[float] = None,
+        board: Optional[chess.Board] = None,
+        multipv: int = 3,
+    ) -> Dict:
+        """Run the engine on a position and package the result.
+
+        Args:
+            engine: Stockfish instance to search with
+            fen: The position in FEN notation
+            depth: Analysis depth
+            time_limit: Maximum time in seconds for analysis (optional)
+            board: The position already parsed from fen (optional)
+            multipv: Number of engine lines to return in top_moves
+
+        Returns:
+            Dictionary containing position analysis
+        """
+        if board is None:
+            board = self._parse_fen(fen)
+        self._check_valid(fen, board)
+
+        # Keep the hash table from earlier searches; entries are keyed by
+        # position, so they only ever help move ordering
+        engine.set_fen_position(board.fen(), send_ucinewgame_token=False)
 
         # Use time limit if provided, otherwise use depth
         if time_limit is not None:
@@ -148,28 +370,40 @@ class ChessAnalyzer:
             time_limit = min(time_limit, 60.0)
             # Convert seconds to milliseconds for Stockfish
             time_ms = int(time_limit * 1000)
-            evaluation = self.stockfish.get_evaluation()
-            best_move_uci = self.stockfish.get_best_move_time(time_ms)
+            evaluation = engine.get_evaluation()
+            best_move_uci = engine.get_best_move_time(time_ms)
             # For timed analysis, we need to get top moves differently
             # Set a reasonable depth limit to prevent infinite analysis
-            self.stockfish.set_depth(min(depth, 20))
-            top_moves = self.stockfish.get_top_moves(3)
+            engine.set_depth(min(depth, 20))
+            top_moves = engine.get_top_moves(multipv)
         else:
-            # Standard depth-based analysis
-            self.stockfish.set_depth(depth)
-            evaluation = self.stockfish.get_evaluation()
-            best_move_uci = self.stockfish.get_best_move()
-            top_moves = self.stockfish.get_top_moves(3)
+            # Standard depth-based analysis: the first top move is the best
+            # move and carries the position's evaluation, so one search gives
+            # all three
+            engine.set_depth(depth)
+            top_moves = engine.get_top_moves(multipv)
+            if top_moves:
+                best_move_uci = top_moves[0]["Move"]
+                evaluation = self._top_move_evaluation(top_moves[0])
+            elif any(board.legal_moves):
+                # The engine returned no lines for a live position, so ask
+                # for the best move and evaluation directly
+                evaluation = engine.get_evaluation()
+                best_move_uci = engine.get_best_move()
+            else:
+                # Checkmate or stalemate; the engine reports the final score
+                best_move_uci = None
+                evaluation = engine.get_evaluation()
 
         # Convert UCI moves to Standard Algebraic Notation
-        best_move = self.uci_to_san(fen, best_move_uci) if best_move_uci else None
+        best_move = self._board_to_san(board, best_move_uci) if best_move_uci else None
 
         # Convert top moves to SAN
         top_moves_san = []
         for move_info in top_moves:
             uci_move = move_info.get("Move")
             if uci_move:
-                san_move = self.uci_to_san(fen, uci_move)
+                san_move = self._board_to_san(board, uci_move)
                 move_info_san = move_info.copy()
                 move_info_san["Move"] = san_move
                 move_info_san["UCI"] = uci_move  # Keep UCI for reference
@@ -177,25 +411,206 @@ class ChessAnalyzer:
             else:
                 top_moves_san.append(move_info)
 
-        analysis_result = {
+        return {
             "fen": fen,
             "evaluation": evaluation,
             "best_move": best_move,
             "best_move_uci": best_move_uci,
             "top_moves": top_moves_san,
+            # Whether the best move captures, read from the board rather than
+            # asking the engine, which validates the move with another search
             "is_check": (
-                self.stockfish.will_move_be_a_capture(best_move_uci)
+                board.is_capture(chess.Move.from_uci(best_move_uci))
                 if best_move_uci
                 else False
             ),
-            "cache_key": cache_key,
+            "depth": depth,
         }
 
-        # Cache the analysis result
-        self._current_fen = fen
-        self._current_analysis = analysis_result
+    def analyze_position_iterative(
+        self,
+        fen: str,
+        max_depth: int = 20,
+        stable_margin: int = 15,
+        time_budget: Optional[float] = None,
+        board: Optional[chess.Board] = None,
+        multipv: int = 3,
+    ) -> Dict:
+        """Analyze a position with iterative deepening.
+
+        Searches at increasing depths up to max_depth and stops early once the
+        evaluation is stable across two consecutive iterations or the time
+        budget is spent. Every iteration goes through the analysis cache, so a
+        cached full-depth result is returned without searching.
+
+        Args:
+            fen: The position in FEN notation
+            max_depth: Deepest search to run
+            stable_margin: Centipawn difference under which two iterations agree
+            time_budget: Seconds after which no deeper iteration is started (optional)
+            board: The position already parsed from fen (optional)
+            multipv: Number of engine lines to return in top_moves (default 3)
+
+        Returns:
+            Dictionary containing the analysis of the last iteration run
+        """
+        if board is None:
+            board = self._parse_fen(fen)
+        cached = self._cache_get_at_least(
+            self._cache_key(board, max_depth, multipv=multipv)
+        )
+        if cached is not None:
+            return {**cached, "fen": fen}
+
+        depths = [d for d in self.ITERATIVE_DEPTHS if d < max_depth] + [max_depth]
+        start = time.monotonic()
+        previous = None
+
+        for depth in depths:
+            analysis = self.analyze_position(fen, depth, board=board, multipv=multipv)
+            if previous is not None and self._evaluations_agree(
+                previous["evaluation"], analysis["evaluation"], stable_margin
+            ):
+                break
+            if time_budget is not None and time.monotonic() - start >= time_budget:
+                break
+            previous = analysis
+
+        return analysis
+
+    @staticmethod
+    def _evaluations_agree(first: Dict, second: Dict, margin: int) -> bool:
+        """Check whether two engine evaluations are within margin of each other."""
+        if first["type"] != second["type"]:
+            return False
+        if first["type"] == "mate":
+            return first["value"] == second["value"]
+        return abs(first["value"] - second["value"]) < margin
+
+    @staticmethod
+    def _parse_fen(fen: str) -> chess.Board:
+        """Parse a FEN string, raising ValueError for malformed input."""
+        try:
+            return chess.Board(fen)
+        except ValueError:
+            raise ValueError(f"Invalid FEN: {fen}")
+
+    @staticmethod
+    def _check_valid(fen: str, board: chess.Board):
+        """Reject positions the engine cannot search.
+
+        Checked with python-chess rather than Stockfish.is_fen_valid, which
+        starts a throwaway engine process on every call. A stray en passant
+        square or castling rights without the matching king and rook are
+        tolerated, as Stockfish does; callers hand the engine board.fen(),
+        which drops them.
+        """
+        status = board.status() & ~(
+            chess.STATUS_INVALID_EP_SQUARE | chess.STATUS_BAD_CASTLING_RIGHTS
+        )
+        if status != chess.STATUS_VALID:
+            raise ValueError(f"Invalid FEN: {fen}")
+
+    def _cache_key(
+        self,
+        board: chess.Board,
+        depth: int,
+        time_limit: Optional[float] = None,
+        multipv: int = 3,
+    ) -> tuple:
+        """Build the analysis cache key for a position.
+
+        Args:
+            board: The position to key
+            depth: Analysis depth
+            time_limit: Time limit in seconds (optional)
+            multipv: Number of engine lines searched
+
+        Returns:
+            Hashable cache key
+        """
+        return (chess.polyglot.zobrist_hash(board), depth, time_limit, multipv)
+
+    def _cache_get(self, key: tuple) -> Optional[Dict]:
+        """Look up a cached analysis and mark it as recently used."""
+        with self._cache_lock:
+            analysis = self._analysis_cache.get(key)
+            if analysis is not None:
+                self._analysis_cache.move_to_end(key)
+            return analysis
+
+    def _cache_get_at_least(self, key: tuple) -> Optional[Dict]:
+        """Look up a depth-limited analysis, accepting one searched deeper.
+
+        Args:
+            key: Cache key of a depth-limited analysis (no time limit)
+
+        Returns:
+            The cached analysis at the key's depth or the deepest cached depth
+            above it, or None if neither is cached
+        """
+        analysis = self._cache_get(key)
+        if analysis is not None:
+            return analysis
+
+        zobrist, depth, _, multipv = key
+        deepest = self._deepest_depths.get((zobrist, multipv))
+        if deepest is None or deepest <= depth:
+            return None
+        return self._cache_get((zobrist, deepest, None, multipv))
+
+    def _cache_put(self, key: tuple, analysis: Dict):
+        """Store an analysis, evicting the least recently used entries."""
+        with self._cache_lock:
+            self._analysis_cache[key] = analysis
+            self._analysis_cache.move_to_end(key)
+
+            # Analysis keys are (hash, depth, time limit, MultiPV); move
+            # evaluations append the move, so their last item never matches
+            # a MultiPV in the depth index
+            zobrist, depth, time_limit, multipv = key[:4]
+            if len(key) == 4 and time_limit is None:
+                position = (zobrist, multipv)
+                if depth > self._deepest_depths.get(position, 0):
+                    self._deepest_depths[position] = depth
+
+            while len(self._analysis_cache) > self.cache_size:
+                evicted, _ = self._analysis_cache.popitem(last=False)
+                position = (evicted[0], evicted[-1])
+                deepest = self._deepest_depths.get(position)
+                if evicted[2] is None and deepest == evicted[1]:
+                    del self._deepest_depths[position]
+
+    def get_cached_analysis(
+        self,
+        fen: str,
+        depth: int,
+        board: Optional[chess.Board] = None,
+        multipv: int = 3,
+    ) -> Optional[Dict]:
+        """Look up a cached analysis without searching.
 
-        return analysis_result
+        Args:
+            fen: The position in FEN notation
+            depth: Analysis depth of the cached result
+            board: The position already parsed from fen (optional)
+            multipv: Number of engine lines of the cached result (default 3)
+
+        Returns:
+            The cached analysis, or None if the position is not cached at that depth
+        """
+        if board is None:
+            board = self._parse_fen(fen)
+        cached = self._cache_get(self._cache_key(board, depth, multipv=multipv))
+        if cached is None:
+            return None
+        return {**cached, "fen": fen}
+
+    def clear_cache(self):
+        """Drop all cached position analyses."""
+        with self._cache_lock:
+            self._analysis_cache.clear()
+            self._deepest_depths.clear()
 
     def analyze_game(self, moves: List[str]) -> List[Dict]:
         """Analyze a complete game given as a list of moves.
@@ -208,28 +623,16 @@ class ChessAnalyzer:
         """
         analyses = []
 
-        # Convert SAN moves to UCI format for Stockfish
-        uci_moves = self.convert_san_moves_to_uci(moves)
+        # Replay the game locally; only the resulting positions go to the engine
+        board = chess.Board()
 
         # Analyze each position in the game
-        for i in range(len(moves)):
+        for i, move in enumerate(moves):
             try:
-                # Set position up to move i - reuse existing instance
-                if i == 0:
-                    # Reset to starting position for first move
-                    self.stockfish.set_position([])
-                else:
-                    # Set position with all previous moves
-                    self.stockfish.set_position(uci_moves[:i])
-
-                # Make the current move
-                if i < len(uci_moves):
-                    self.stockfish.make_moves_from_current_position([uci_moves[i]])
-
-                fen = self.stockfish.get_fen_position()
-                analysis = self.analyze_position(fen)
+                board.push_san(move)
+                analysis = self.analyze_position(board.fen(), board=board)
                 analysis["move_number"] = i + 1
-                analysis["move"] = moves[i]  # Keep original SAN move
+                analysis["move"] = move  # Keep original SAN move
                 analyses.append(analysis)
 
             except Exception as e:
@@ -310,21 +713,17 @@ class ChessAnalyzer:
         Returns:
             Dictionary containing the principal variation analysis
         """
-        if not self.stockfish.is_fen_valid(fen):
-            raise ValueError(f"Invalid FEN: {fen}")
+        start_board = self._parse_fen(fen)
+        self._check_valid(fen, start_board)
 
         pv_moves = []
         pv_analysis = []
-        current_fen = fen
+        current_fen = start_board.fen()
 
         try:
             board = chess.Board(fen)
 
             for move_num in range(max_moves):
-                # Analyze current position (reuse cached analysis if available)
-                if current_fen != self._current_fen:
-                    self.stockfish.set_fen_position(current_fen)
-
                 # Use time limit if provided, otherwise use depth
                 if time_limit is not None:
                     # Enforce hard limit of 1 minute for good UX
@@ -334,28 +733,39 @@ class ChessAnalyzer:
                         time_limit / max(max_moves, 5), 2.0
                     )  # Max 2 seconds per move
                     time_ms = int(time_per_move * 1000)
-                    evaluation = self.stockfish.get_evaluation()
-                    best_move_uci = self.stockfish.get_best_move_time(time_ms)
-                else:
-                    self.stockfish.set_depth(depth)
-                    evaluation = self.stockfish.get_evaluation()
-                    best_move_uci = self.stockfish.get_best_move()
+
+                # Analyze current position, keeping the hash table warm
+                with self._engine_lock:
+                    self.stockfish.set_fen_position(
+                        current_fen, send_ucinewgame_token=False
+                    )
+                    if time_limit is not None:
+                        evaluation = self.stockfish.get_evaluation()
+                        best_move_uci = self.stockfish.get_best_move_time(time_ms)
+                    else:
+                        # One search gives both the best move and its score
+                        self.stockfish.set_depth(depth)
+                        top_moves = self.stockfish.get_top_moves(1)
+                        best_move_uci = top_moves[0]["Move"] if top_moves else None
+                        if best_move_uci:
+                            evaluation = self._top_move_evaluation(top_moves[0])
 
                 if not best_move_uci:
                     # No more moves (checkmate, stalemate, or error)
                     break
 
-                # Convert UCI to SAN
-                best_move_san = self.uci_to_san(current_fen, best_move_uci)
-
-                # Make the move on our board
+                # Make the move on our board, reading the SAN before it
                 try:
-                    chess_move = board.parse_san(best_move_san)
-                    board.push(chess_move)
-                    new_fen = board.fen()
-                except:
+                    chess_move = chess.Move.from_uci(best_move_uci)
+                except ValueError:
                     # Move parsing failed
                     break
+                if not board.is_legal(chess_move):
+                    break
+                best_move_san = board.san(chess_move)
+                to_move = "White" if board.turn else "Black"
+                board.push(chess_move)
+                new_fen = board.fen()
 
                 # Store this move in the variation
                 move_info = {
@@ -365,7 +775,7 @@ class ChessAnalyzer:
                     "fen_before": current_fen,
                     "fen_after": new_fen,
                     "evaluation": evaluation,
-                    "to_move": "White" if chess.Board(current_fen).turn else "Black",
+                    "to_move": to_move,
                 }
 
                 pv_moves.append(best_move_san)
@@ -407,6 +817,13 @@ class ChessAnalyzer:
             "analysis_depth": depth,
         }
 
+    @staticmethod
+    def _top_move_evaluation(move_info: Dict) -> Dict:
+        """Turn the score of a get_top_moves entry into an evaluation dict."""
+        if move_info.get("Mate") is not None:
+            return {"type": "mate", "value": move_info["Mate"]}
+        return {"type": "cp", "value": move_info["Centipawn"]}
+
     def evaluate_candidate_moves(
         self, fen: str, candidate_moves: List[str], depth: int = 15
     ) -> Dict:
@@ -423,8 +840,7 @@ class ChessAnalyzer:
         Returns:
             Dictionary with evaluations for each candidate move
         """
-        if not self.stockfish.is_fen_valid(fen):
-            raise ValueError(f"Invalid FEN: {fen}")
+        self._check_valid(fen, self._parse_fen(fen))
 
         results = {
             "position_fen": fen,
@@ -435,8 +851,6 @@ class ChessAnalyzer:
 
         try:
             board = chess.Board(fen)
-            self.stockfish.set_fen_position(fen)
-            self.stockfish.set_depth(depth)
 
             best_eval = None
             best_move = None
@@ -448,7 +862,7 @@ class ChessAnalyzer:
 
                     # Validate move is legal
                     chess_move = board.parse_san(move_san)
-                    if chess_move not in board.legal_moves:
+                    if not board.is_legal(chess_move):
                         results["candidate_evaluations"].append(
                             {"move": move_san, "error": "Illegal move"}
                         )
@@ -460,8 +874,12 @@ class ChessAnalyzer:
                     new_fen = temp_board.fen()
 
                     # Get evaluation after this move (from opponent's perspective)
-                    self.stockfish.set_fen_position(new_fen)
-                    evaluation = self.stockfish.get_evaluation()
+                    with self._engine_lock:
+                        self.stockfish.set_fen_position(
+                            new_fen, send_ucinewgame_token=False
+                        )
+                        self.stockfish.set_depth(depth)
+                        evaluation = self.stockfish.get_evaluation()
 
                     # Flip evaluation for current player's perspective
                     if evaluation["type"] == "cp":
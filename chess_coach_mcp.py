@@ -2,7 +2,12 @@
 """Babelfish Chess Coach MCP Server - Comprehensive Chess Analysis for Players."""
 
 import asyncio
+import bisect
 import chess
+import itertools
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.server.models import InitializationOptions
@@ -10,330 +15,328 @@ from mcp.server import NotificationOptions
 from mcp.types import TextContent, Tool
 from babelfish.chess_analyzer import ChessAnalyzer
 
-
-async def main():
-    # Create server
-    server = Server("babelfish-coach")
-    analyzer = ChessAnalyzer()
-
-    @server.list_tools()
-    async def handle_list_tools() -> list[Tool]:
-        """List available chess coaching tools."""
-        return [
-            Tool(
-                name="analyze_position",
-                description="MANDATORY TOOL FOR POSITION ANALYSIS: Analyze a chess position in FEN notation with authoritative engine evaluation. DO NOT make claims about position evaluation, best moves, or strategic assessment without using this tool first. Returns engine evaluation (in centipawns or mate distance), top 5 best moves with evaluations, strategic guidance based on game phase, and human-readable position explanation. PREVENTS evaluation hallucinations by providing concrete engine analysis. ALWAYS use this tool when discussing any position.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "fen": {
-                            "type": "string",
-                            "description": "The chess position in FEN notation (copy from chess.com, lichess, or any chess app)",
-                        },
-                        "depth": {
-                            "type": "integer",
-                            "description": "Analysis strength: 15=fast, 20=standard, 25=deep (default: 20)",
-                            "default": 20,
-                            "minimum": 10,
-                            "maximum": 30,
-                        },
-                    },
-                    "required": ["fen"],
+# Tool definitions never change, so build them once instead of per tools/list request
+COACHING_TOOLS = [
+    Tool(
+        name="analyze_position",
+        description="MANDATORY TOOL FOR POSITION ANALYSIS: Analyze a chess position in FEN notation with authoritative engine evaluation. DO NOT make claims about position evaluation, best moves, or strategic assessment without using this tool first. Returns engine evaluation (in centipawns or mate distance), top 5 best moves with evaluations, strategic guidance based on game phase, and human-readable position explanation. PREVENTS evaluation hallucinations by providing concrete engine analysis. ALWAYS use this tool when discussing any position.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fen": {
+                    "type": "string",
+                    "description": "The chess position in FEN notation (copy from chess.com, lichess, or any chess app)",
                 },
-            ),
-            Tool(
-                name="evaluate_move",
-                description="MANDATORY FOR MOVE EVALUATION: Evaluate the quality of a specific move with authoritative engine assessment. Takes a FEN and a move in algebraic notation, returns definitive move rating (Excellent/Good/Questionable/Bad/Blunder), precise evaluation change in centipawns, comparison with engine's preferred move, and concrete alternatives. DO NOT assess move quality without using this tool - provides objective engine-based ratings that prevent move evaluation errors.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "fen": {
-                            "type": "string",
-                            "description": "The position before the move (FEN notation)",
-                        },
-                        "move": {
-                            "type": "string",
-                            "description": "The move to evaluate in algebraic notation (e.g., 'Nf3', 'exd5', 'O-O')",
-                        },
-                        "depth": {
-                            "type": "integer",
-                            "description": "Analysis depth (default: 20)",
-                            "default": 20,
-                            "minimum": 15,
-                            "maximum": 25,
-                        },
-                    },
-                    "required": ["fen", "move"],
+                "depth": {
+                    "type": "integer",
+                    "description": "Analysis strength: 15=fast, 20=standard, 25=deep (default: 20)",
+                    "default": 20,
+                    "minimum": 10,
+                    "maximum": 30,
                 },
-            ),
-            Tool(
-                name="find_tactics",
-                description="TACTICAL ANALYSIS AUTHORITY: Identify tactical opportunities with high-depth engine analysis (depth 22). Finds forced sequences, mate threats, major tactical advantages, and concrete tactical motifs. Returns precise evaluation assessment, specific tactical moves with types (capture, check, promotion), and tactical pattern identification. Use when analyzing positions for tactical elements - provides definitive tactical assessment.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "fen": {
-                            "type": "string",
-                            "description": "The position to analyze for tactics (FEN notation)",
-                        }
-                    },
-                    "required": ["fen"],
+            },
+            "required": ["fen"],
+        },
+    ),
+    Tool(
+        name="evaluate_move",
+        description="MANDATORY FOR MOVE EVALUATION: Evaluate the quality of a specific move with authoritative engine assessment. Takes a FEN and a move in algebraic notation, returns definitive move rating (Excellent/Good/Questionable/Bad/Blunder), precise evaluation change in centipawns, comparison with engine's preferred move, and concrete alternatives. DO NOT assess move quality without using this tool - provides objective engine-based ratings that prevent move evaluation errors.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fen": {
+                    "type": "string",
+                    "description": "The position before the move (FEN notation)",
                 },
-            ),
-            Tool(
-                name="opening_analysis",
-                description="OPENING POSITION ANALYZER: Analyze early-game positions (moves 1-15) with opening-specific engine guidance. Returns precise position evaluation, concrete recommended moves, move-number-based opening principles, objective piece development assessment for both sides. Accepts optional moves_played array for opening identification. Use for opening phase positions to get authoritative opening analysis.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "fen": {
-                            "type": "string",
-                            "description": "The opening position to analyze (FEN notation)",
-                        },
-                        "moves_played": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "The moves that led to this position (optional, helps with opening identification)",
-                            "default": [],
-                        },
-                    },
-                    "required": ["fen"],
+                "move": {
+                    "type": "string",
+                    "description": "The move to evaluate in algebraic notation (e.g., 'Nf3', 'exd5', 'O-O')",
                 },
-            ),
-            Tool(
-                name="endgame_guidance",
-                description="ENDGAME TECHNIQUE AUTHORITY: Analyze endgame positions with specialized deep analysis (depth 25). Identifies exact material imbalances, provides definitive endgame guidance based on piece configuration (K+P vs K, K+Q vs K, etc.), and gives concrete endgame principles. Use for positions with limited material to get authoritative endgame technique analysis.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "fen": {
-                            "type": "string",
-                            "description": "The endgame position to analyze (FEN notation)",
-                        }
-                    },
-                    "required": ["fen"],
+                "depth": {
+                    "type": "integer",
+                    "description": "Analysis depth (default: 20)",
+                    "default": 20,
+                    "minimum": 15,
+                    "maximum": 25,
                 },
-            ),
-            Tool(
-                name="explore_moves",
-                description="MOVE COMPARISON ENGINE: Test multiple candidate moves and compare outcomes with precise engine analysis. Takes FEN and move array, validates legality, calculates exact resulting positions and evaluations, provides objective move quality ratings, identifies concrete move properties (captures, checks, promotions), ranks moves by engine strength. ESSENTIAL for testing chess ideas - prevents move speculation by providing actual consequences.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "fen": {
-                            "type": "string",
-                            "description": "The starting position (FEN notation)",
-                        },
-                        "candidate_moves": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of moves to try in algebraic notation (e.g., ['Nf3', 'e4', 'O-O', 'd4']). Include 3-5 candidate moves to explore.",
-                            "minItems": 1,
-                            "maxItems": 12,
-                        },
-                        "depth": {
-                            "type": "integer",
-                            "description": "Analysis depth for each resulting position (default: 18)",
-                            "default": 18,
-                            "minimum": 12,
-                            "maximum": 25,
-                        },
-                    },
-                    "required": ["fen", "candidate_moves"],
+            },
+            "required": ["fen", "move"],
+        },
+    ),
+    Tool(
+        name="find_tactics",
+        description="TACTICAL ANALYSIS AUTHORITY: Identify tactical opportunities with high-depth engine analysis (depth 22). Finds forced sequences, mate threats, major tactical advantages, and concrete tactical motifs. Returns precise evaluation assessment, specific tactical moves with types (capture, check, promotion), and tactical pattern identification. Use when analyzing positions for tactical elements - provides definitive tactical assessment.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fen": {
+                    "type": "string",
+                    "description": "The position to analyze for tactics (FEN notation)",
+                }
+            },
+            "required": ["fen"],
+        },
+    ),
+    Tool(
+        name="opening_analysis",
+        description="OPENING POSITION ANALYZER: Analyze early-game positions (moves 1-15) with opening-specific engine guidance. Returns precise position evaluation, concrete recommended moves, move-number-based opening principles, objective piece development assessment for both sides. Accepts optional moves_played array for opening identification. Use for opening phase positions to get authoritative opening analysis.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fen": {
+                    "type": "string",
+                    "description": "The opening position to analyze (FEN notation)",
                 },
-            ),
-            Tool(
-                name="analyze_variations",
-                description="VARIATION SEQUENCE ANALYZER: Analyze multiple-move sequences (variations) with precise engine evaluation. Takes FEN and array of move sequences (3-6 moves deep), shows exact variation development, provides final position evaluations, identifies concrete tactical/positional themes. Essential for understanding multi-move sequences - reveals how strategic plans actually develop over multiple moves.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "fen": {
-                            "type": "string",
-                            "description": "The starting position (FEN notation)",
-                        },
-                        "variations": {
-                            "type": "array",
-                            "items": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                                "description": "A sequence of moves (2-4 moves) in algebraic notation",
-                            },
-                            "description": "List of move sequences to analyze (e.g., [['e4', 'e5', 'Nf3', 'Nc6'], ['d4', 'd5', 'c4', 'e6'], ['Nf3', 'Nf6', 'Bg5', 'Be7', 'e4']]). Each variation should be 3-6 moves long.",
-                            "minItems": 1,
-                            "maxItems": 10,
-                        },
-                        "depth": {
-                            "type": "integer",
-                            "description": "Analysis depth for final positions (default: 20)",
-                            "default": 20,
-                            "minimum": 15,
-                            "maximum": 25,
-                        },
-                    },
-                    "required": ["fen", "variations"],
+                "moves_played": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "The moves that led to this position (optional, helps with opening identification)",
+                    "default": [],
                 },
-            ),
-            Tool(
-                name="apply_moves",
-                description="CRITICAL TOOL: Apply moves to a FEN position to get the correct resulting FEN. Takes a starting FEN and list of moves in algebraic notation, validates each move's legality, and returns the accurate final position. ALWAYS use this tool instead of trying to calculate FEN positions manually - chess position calculation is extremely error-prone and leads to incorrect analysis. This tool is essential for accurate move sequences and position analysis.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "starting_fen": {
-                            "type": "string",
-                            "description": "The starting chess position in FEN notation",
-                        },
-                        "moves": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of moves to apply in standard algebraic notation (e.g., ['e4', 'e5', 'Nf3', 'Nc6']). Each move will be validated and applied sequentially.",
-                            "minItems": 1,
-                            "maxItems": 30,
-                        },
-                        "show_progression": {
-                            "type": "boolean",
-                            "description": "Whether to show the position after each move (default: false, only shows final position)",
-                            "default": False,
-                        },
-                    },
-                    "required": ["starting_fen", "moves"],
+            },
+            "required": ["fen"],
+        },
+    ),
+    Tool(
+        name="endgame_guidance",
+        description="ENDGAME TECHNIQUE AUTHORITY: Analyze endgame positions with specialized deep analysis (depth 25). Identifies exact material imbalances, provides definitive endgame guidance based on piece configuration (K+P vs K, K+Q vs K, etc.), and gives concrete endgame principles. Use for positions with limited material to get authoritative endgame technique analysis.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fen": {
+                    "type": "string",
+                    "description": "The endgame position to analyze (FEN notation)",
+                }
+            },
+            "required": ["fen"],
+        },
+    ),
+    Tool(
+        name="explore_moves",
+        description="MOVE COMPARISON ENGINE: Test multiple candidate moves and compare outcomes with precise engine analysis. Takes FEN and move array, validates legality, calculates exact resulting positions and evaluations, provides objective move quality ratings, identifies concrete move properties (captures, checks, promotions), ranks moves by engine strength. ESSENTIAL for testing chess ideas - prevents move speculation by providing actual consequences.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fen": {
+                    "type": "string",
+                    "description": "The starting position (FEN notation)",
                 },
-            ),
-            Tool(
-                name="show_engine_line",
-                description="ENGINE'S MASTER PLAN REVEALER: Show the engine's complete main line (principal variation) up to 20+ moves deep. Reveals the engine's definitive winning plan or best continuation with step-by-step analysis. Provides concrete long-term strategic understanding, precise endgame technique, detailed tactical sequences. Use when you need the ENGINE'S COMPLETE STRATEGIC PLAN rather than single-move analysis.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "fen": {
-                            "type": "string",
-                            "description": "The chess position in FEN notation",
-                        },
-                        "depth": {
-                            "type": "integer",
-                            "description": "Analysis depth for the main line (default: 22, higher shows longer plans)",
-                            "default": 22,
-                            "minimum": 15,
-                            "maximum": 30,
-                        },
-                        "moves": {
-                            "type": "integer",
-                            "description": "Maximum number of moves to show in the main line (default: 20)",
-                            "default": 20,
-                            "minimum": 10,
-                            "maximum": 40,
-                        },
-                    },
-                    "required": ["fen"],
+                "candidate_moves": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of moves to try in algebraic notation (e.g., ['Nf3', 'e4', 'O-O', 'd4']). Include 3-5 candidate moves to explore.",
+                    "minItems": 1,
+                    "maxItems": 12,
                 },
-            ),
-            Tool(
-                name="analyze_chess_concepts",
-                description="MANDATORY BEFORE ANY CHESS DISCUSSION: Analyze and identify key chess concepts in a position with precise definitions and examples. CRITICAL - DO NOT make any claims about passed pawns, pawn majorities, pawn structure, piece activity, or strategic elements without FIRST using this tool to verify. This prevents chess concept hallucinations and provides authoritative analysis. Identifies passed pawns, isolated pawns, doubled pawns, weak squares, pawn chains, piece activity, king safety with exact counts and precise definitions. USE THIS BEFORE DISCUSSING ANY POSITION.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "fen": {
-                            "type": "string",
-                            "description": "The chess position in FEN notation",
-                        },
-                        "focus": {
-                            "type": "array",
-                            "items": {
-                                "type": "string",
-                                "enum": [
-                                    "passed_pawns",
-                                    "pawn_structure",
-                                    "piece_activity",
-                                    "king_safety",
-                                    "weak_squares",
-                                    "all",
-                                ],
-                            },
-                            "description": "Specific concepts to analyze. Use 'all' for comprehensive analysis, or specify: 'passed_pawns', 'pawn_structure', 'piece_activity', 'king_safety', 'weak_squares'",
-                            "default": ["all"],
-                        },
-                    },
-                    "required": ["fen"],
+                "depth": {
+                    "type": "integer",
+                    "description": "Analysis depth for each resulting position (default: 18)",
+                    "default": 18,
+                    "minimum": 12,
+                    "maximum": 25,
                 },
-            ),
-            Tool(
-                name="visualize_board",
-                description="ESSENTIAL FOR BOARD UNDERSTANDING: Convert cryptic FEN notation into clear, human-readable board visualization. Shows piece positions with proper symbols, square names, file/rank labels, and key position information. CRITICAL for understanding what's actually on the board - FEN notation is compact but hard to interpret. Use this tool whenever you need to understand or discuss board positions clearly. Prevents misunderstanding of piece placement and board state.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "fen": {
-                            "type": "string",
-                            "description": "The chess position in FEN notation to visualize",
-                        },
-                        "show_coordinates": {
-                            "type": "boolean",
-                            "description": "Whether to show file/rank coordinates (default: true)",
-                            "default": True,
-                        },
-                        "highlight_pieces": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "Optional list of piece types to highlight (e.g., ['pawn', 'king']) for educational focus",
-                            "default": [],
-                        },
+                "include_engine_response": {
+                    "type": "boolean",
+                    "description": "Also show the engine's reply after moves it already ranked; found with a shallower search (default: false)",
+                    "default": False,
+                },
+            },
+            "required": ["fen", "candidate_moves"],
+        },
+    ),
+    Tool(
+        name="analyze_variations",
+        description="VARIATION SEQUENCE ANALYZER: Analyze multiple-move sequences (variations) with precise engine evaluation. Takes FEN and array of move sequences (3-6 moves deep), shows exact variation development, provides final position evaluations, identifies concrete tactical/positional themes. Essential for understanding multi-move sequences - reveals how strategic plans actually develop over multiple moves.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fen": {
+                    "type": "string",
+                    "description": "The starting position (FEN notation)",
+                },
+                "variations": {
+                    "type": "array",
+                    "items": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "A sequence of moves (2-4 moves) in algebraic notation",
                     },
-                    "required": ["fen"],
+                    "description": "List of move sequences to analyze (e.g., [['e4', 'e5', 'Nf3', 'Nc6'], ['d4', 'd5', 'c4', 'e6'], ['Nf3', 'Nf6', 'Bg5', 'Be7', 'e4']]). Each variation should be 3-6 moves long.",
+                    "minItems": 1,
+                    "maxItems": 10,
                 },
-            ),
-            Tool(
-                name="list_legal_moves",
-                description="ESSENTIAL VERIFICATION TOOL: Generate a complete list of all legal moves in a chess position. ALWAYS use this tool before discussing or analyzing specific moves to prevent move hallucinations. Chess move legality is complex (blocked squares, pins, checks, castling rights) and cannot be reliably determined without this tool. Returns all possible moves in standard algebraic notation, categorized by move type. Critical for accuracy when explaining or evaluating any move.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "fen": {
-                            "type": "string",
-                            "description": "The chess position in FEN notation",
-                        },
-                        "categorize": {
-                            "type": "boolean",
-                            "description": "Whether to categorize moves by type (captures, checks, etc.) or just return a simple list (default: true)",
-                            "default": True,
-                        },
+                "depth": {
+                    "type": "integer",
+                    "description": "Analysis depth for final positions (default: 20)",
+                    "default": 20,
+                    "minimum": 15,
+                    "maximum": 25,
+                },
+            },
+            "required": ["fen", "variations"],
+        },
+    ),
+    Tool(
+        name="apply_moves",
+        description="CRITICAL TOOL: Apply moves to a FEN position to get the correct resulting FEN. Takes a starting FEN and list of moves in algebraic notation, validates each move's legality, and returns the accurate final position. ALWAYS use this tool instead of trying to calculate FEN positions manually - chess position calculation is extremely error-prone and leads to incorrect analysis. This tool is essential for accurate move sequences and position analysis.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "starting_fen": {
+                    "type": "string",
+                    "description": "The starting chess position in FEN notation",
+                },
+                "moves": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of moves to apply in standard algebraic notation (e.g., ['e4', 'e5', 'Nf3', 'Nc6']). Each move will be validated and applied sequentially.",
+                    "minItems": 1,
+                    "maxItems": 30,
+                },
+                "show_progression": {
+                    "type": "boolean",
+                    "description": "Whether to show the position after each move (default: false, only shows final position)",
+                    "default": False,
+                },
+                "include_evaluation": {
+                    "type": "boolean",
+                    "description": "Whether to add a quick engine evaluation of the final position (default: true)",
+                    "default": True,
+                },
+                "quick_depth": {
+                    "type": "integer",
+                    "description": "Engine depth for the quick evaluation of the final position (default: 10). Use analyze_position for a deeper look.",
+                    "default": 10,
+                    "minimum": 1,
+                    "maximum": 20,
+                },
+            },
+            "required": ["starting_fen", "moves"],
+        },
+    ),
+    Tool(
+        name="show_engine_line",
+        description="ENGINE'S MASTER PLAN REVEALER: Show the engine's complete main line (principal variation) up to 20+ moves deep. Reveals the engine's definitive winning plan or best continuation with step-by-step analysis. Provides concrete long-term strategic understanding, precise endgame technique, detailed tactical sequences. Use when you need the ENGINE'S COMPLETE STRATEGIC PLAN rather than single-move analysis.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fen": {
+                    "type": "string",
+                    "description": "The chess position in FEN notation",
+                },
+                "depth": {
+                    "type": "integer",
+                    "description": "Analysis depth for the main line (default: 22, higher shows longer plans)",
+                    "default": 22,
+                    "minimum": 15,
+                    "maximum": 30,
+                },
+                "moves": {
+                    "type": "integer",
+                    "description": "Maximum number of moves to show in the main line (default: 20)",
+                    "default": 20,
+                    "minimum": 10,
+                    "maximum": 40,
+                },
+            },
+            "required": ["fen"],
+        },
+    ),
+    Tool(
+        name="analyze_chess_concepts",
+        description="MANDATORY BEFORE ANY CHESS DISCUSSION: Analyze and identify key chess concepts in a position with precise definitions and examples. CRITICAL - DO NOT make any claims about passed pawns, pawn majorities, pawn structure, piece activity, or strategic elements without FIRST using this tool to verify. This prevents chess concept hallucinations and provides authoritative analysis. Identifies passed pawns, isolated pawns, doubled pawns, weak squares, pawn chains, piece activity, king safety with exact counts and precise definitions. USE THIS BEFORE DISCUSSING ANY POSITION.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fen": {
+                    "type": "string",
+                    "description": "The chess position in FEN notation",
+                },
+                "focus": {
+                    "type": "array",
+                    "items": {
+                        "type": "string",
+                        "enum": [
+                            "passed_pawns",
+                            "pawn_structure",
+                            "piece_activity",
+                            "king_safety",
+                            "weak_squares",
+                            "all",
+                        ],
                     },
-                    "required": ["fen"],
+                    "description": "Specific concepts to analyze. Use 'all' for comprehensive analysis, or specify: 'passed_pawns', 'pawn_structure', 'piece_activity', 'king_safety', 'weak_squares'",
+                    "default": ["all"],
                 },
-            ),
-        ]
+            },
+            "required": ["fen"],
+        },
+    ),
+    Tool(
+        name="visualize_board",
+        description="ESSENTIAL FOR BOARD UNDERSTANDING: Convert cryptic FEN notation into clear, human-readable board visualization. Shows piece positions with proper symbols, square names, file/rank labels, and key position information. CRITICAL for understanding what's actually on the board - FEN notation is compact but hard to interpret. Use this tool whenever you need to understand or discuss board positions clearly. Prevents misunderstanding of piece placement and board state.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fen": {
+                    "type": "string",
+                    "description": "The chess position in FEN notation to visualize",
+                },
+                "show_coordinates": {
+                    "type": "boolean",
+                    "description": "Whether to show file/rank coordinates (default: true)",
+                    "default": True,
+                },
+                "highlight_pieces": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Optional list of piece types to highlight (e.g., ['pawn', 'king']) for educational focus",
+                    "default": [],
+                },
+            },
+            "required": ["fen"],
+        },
+    ),
+    Tool(
+        name="list_legal_moves",
+        description="ESSENTIAL VERIFICATION TOOL: Generate a complete list of all legal moves in a chess position. ALWAYS use this tool before discussing or analyzing specific moves to prevent move hallucinations. Chess move legality is complex (blocked squares, pins, checks, castling rights) and cannot be reliably determined without this tool. Returns all possible moves in standard algebraic notation, categorized by move type. Critical for accuracy when explaining or evaluating any move.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "fen": {
+                    "type": "string",
+                    "description": "The chess position in FEN notation",
+                },
+                "categorize": {
+                    "type": "boolean",
+                    "description": "Whether to categorize moves by type (captures, checks, etc.) or just return a simple list (default: true)",
+                    "default": True,
+                },
+            },
+            "required": ["fen"],
+        },
+    ),
+]
+
+
+async def main():
+    # Create server
+    server = Server("babelfish-coach")
+    analyzer = ChessAnalyzer()
+
+    @server.list_tools()
+    async def handle_list_tools() -> list[Tool]:
+        """List available chess coaching tools."""
+        return COACHING_TOOLS
 
     @server.call_tool()
     async def handle_call_tool(name: str, arguments: dict) -> list[TextContent]:
         """Handle chess coaching tool calls."""
         try:
-            if name == "analyze_position":
-                return await analyze_position_comprehensive(arguments, analyzer)
-            elif name == "evaluate_move":
-                return await evaluate_specific_move(arguments, analyzer)
-            elif name == "find_tactics":
-                return await find_tactical_opportunities(arguments, analyzer)
-            elif name == "opening_analysis":
-                return await analyze_opening_position(arguments, analyzer)
-            elif name == "endgame_guidance":
-                return await provide_endgame_guidance(arguments, analyzer)
-            elif name == "explore_moves":
-                return await explore_candidate_moves(arguments, analyzer)
-            elif name == "analyze_variations":
-                return await analyze_variations(arguments, analyzer)
-            elif name == "apply_moves":
-                return await apply_moves_to_fen(arguments, analyzer)
-            elif name == "show_engine_line":
-                return await show_engine_main_line(arguments, analyzer)
-            elif name == "analyze_chess_concepts":
-                return await analyze_chess_concepts(arguments, analyzer)
-            elif name == "visualize_board":
-                return await visualize_board_position(arguments, analyzer)
-            elif name == "list_legal_moves":
-                return await list_legal_moves(arguments, analyzer)
-            else:
+            handler = TOOL_HANDLERS.get(name)
+            if handler is None:
                 return [TextContent(type="text", text="❌ Unknown tool")]
+            return await handler(arguments, analyzer)
 
         except Exception as e:
             return [TextContent(type="text", text=f"❌ Error: {str(e)}")]
@@ -354,6 +357,32 @@ async def main():
         )
 
 
+# Strategic guidance appended to the position analysis, by game phase
+PHASE_GUIDANCE = {
+    "Opening": """
+
+**📚 Opening Principles:**
+• Develop pieces toward the center
+• Control central squares (e4, e5, d4, d5)
+• Castle early for king safety
+• Don't move the same piece twice without reason""",
+    "Middlegame": """
+
+**⚔️ Middlegame Strategy:**
+• Look for tactical opportunities (pins, forks, skewers)
+• Improve piece coordination and activity
+• Create weaknesses in opponent's position
+• Consider pawn breaks and space advantage""",
+    "Endgame": """
+
+**🏁 Endgame Technique:**
+• Activate your king - it's a strong piece in the endgame
+• Create passed pawns and support their advance
+• Use opposition and key squares in pawn endings
+• Centralize pieces and coordinate them""",
+}
+
+
 async def analyze_position_comprehensive(
     arguments: dict, analyzer: ChessAnalyzer
 ) -> list[TextContent]:
@@ -365,54 +394,40 @@ async def analyze_position_comprehensive(
         return [TextContent(type="text", text="❌ Please provide a FEN position")]
 
     try:
-        # Get basic analysis
-        analysis = analyzer.analyze_position(fen, depth)
-        explanation = analyzer.get_position_explanation(fen)
-
-        # Determine game phase
         board = chess.Board(fen)
-        piece_count = len([p for p in board.piece_map().values()])
 
-        if piece_count <= 10:
-            phase = "Endgame"
-        elif piece_count <= 20:
-            phase = "Middlegame"
-        else:
-            phase = "Opening"
+        # Get basic analysis, deepening only until the evaluation settles. The
+        # search runs in a worker thread so the event loop keeps serving.
+        analysis = await asyncio.to_thread(
+            analyzer.analyze_position_iterative, fen, depth, board=board
+        )
+        explanation = analyzer.get_position_explanation(fen, analysis)
+
+        # Determine game phase
+        phase = game_phase(board)
 
         # Format comprehensive analysis
         eval_info = analysis["evaluation"]
         if eval_info["type"] == "cp":
             eval_text = f"{eval_info['value']/100:+.1f} pawns"
-            if abs(eval_info["value"]) < 50:
-                eval_desc = "Equal position"
-            elif eval_info["value"] > 300:
-                eval_desc = "Winning advantage for White"
-            elif eval_info["value"] < -300:
-                eval_desc = "Winning advantage for Black"
-            elif eval_info["value"] > 100:
-                eval_desc = "Clear advantage for White"
-            elif eval_info["value"] < -100:
-                eval_desc = "Clear advantage for Black"
-            else:
-                eval_desc = "Slight advantage"
+            eval_desc = describe_evaluation(eval_info["value"])
         else:
             moves = eval_info["value"]
             side = "White" if moves > 0 else "Black"
             eval_text = f"Mate in {abs(moves)}"
             eval_desc = f"Forced mate for {side}"
 
-        response = f"""🎯 **Comprehensive Position Analysis**
+        parts = [f"""🎯 **Comprehensive Position Analysis**
 
 **Position Overview:**
 • Game Phase: {phase}
 • Evaluation: {eval_text} ({eval_desc})
-• To Move: {"White" if "w" in fen else "Black"}
+• To Move: {"White" if board.turn else "Black"}
 
 **📊 Engine Analysis:**
 {explanation}
 
-**🎲 Best Moves & Plans:**"""
+**🎲 Best Moves & Plans:**"""]
 
         for i, move_info in enumerate(analysis["top_moves"][:3], 1):
             move = move_info["Move"]
@@ -420,44 +435,30 @@ async def analyze_position_comprehensive(
             cp_text = f"{cp/100:+.1f}" if cp is not None else "0.00"
 
             if i == 1:
-                response += f"\n**{i}. {move}** ({cp_text}) ← Engine's top choice"
+                parts.append(f"\n**{i}. {move}** ({cp_text}) ← Engine's top choice")
             else:
-                response += f"\n{i}. {move} ({cp_text})"
+                parts.append(f"\n{i}. {move} ({cp_text})")
 
         # Add strategic guidance based on position
-        if phase == "Opening":
-            response += """
-
-**📚 Opening Principles:**
-• Develop pieces toward the center
-• Control central squares (e4, e5, d4, d5)
-• Castle early for king safety
-• Don't move the same piece twice without reason"""
-
-        elif phase == "Middlegame":
-            response += """
-
-**⚔️ Middlegame Strategy:**
-• Look for tactical opportunities (pins, forks, skewers)
-• Improve piece coordination and activity
-• Create weaknesses in opponent's position
-• Consider pawn breaks and space advantage"""
+        parts.append(PHASE_GUIDANCE[phase])
+        parts.append(
+            f"\n\n*Analysis depth: {analysis['depth']} • Powered by Stockfish*"
+        )
 
-        else:  # Endgame
-            response += """
+        return [TextContent(type="text", text="".join(parts))]
 
-**🏁 Endgame Technique:**
-• Activate your king - it's a strong piece in the endgame
-• Create passed pawns and support their advance
-• Use opposition and key squares in pawn endings
-• Centralize pieces and coordinate them"""
+    except Exception as e:
+        return [TextContent(type="text", text=f"❌ Analysis error: {str(e)}")]
 
-        response += f"\n\n*Analysis depth: {depth} • Powered by Stockfish*"
 
-        return [TextContent(type="text", text=response)]
+# Static advice added to the evaluation of a bad move or blunder
+MOVE_IMPROVEMENT_TIPS = """
 
-    except Exception as e:
-        return [TextContent(type="text", text=f"❌ Analysis error: {str(e)}")]
+**🚨 Improvement Tips:**
+• Look for tactical motifs (pins, forks, discovered attacks)
+• Consider your opponent's threats before moving
+• Ensure piece safety and coordination
+• Ask: "What does this move accomplish?"""
 
 
 async def evaluate_specific_move(
@@ -476,133 +477,140 @@ async def evaluate_specific_move(
         ]
 
     try:
-        # Analyze position before move
-        before_analysis = analyzer.analyze_position(fen, depth)
-
-        # Try to make the move
+        # Parse the move first so invalid input never reaches the engine
         board = chess.Board(fen)
+        black_to_move = board.turn == chess.BLACK
         try:
-            chess_move = board.parse_san(move)
-            board.push(chess_move)
-            after_fen = board.fen()
-        except:
+            move_san = board.san(chess.Move.from_uci(san_to_uci(board.epd(), move)))
+        except ValueError:
             return [TextContent(type="text", text=f"❌ Invalid move: {move}")]
 
-        # Get engine's assessment of the move from top_moves if available
-        move_centipawn = None
-        for move_info in before_analysis["top_moves"]:
-            if move_info["Move"] == move:
-                move_centipawn = move_info.get("Centipawn")
-                break
-
-        if move_centipawn is not None:
-            # Use the engine's direct evaluation of this move
-            best_centipawn = before_analysis["top_moves"][0].get("Centipawn", 0)
-            eval_change = move_centipawn - best_centipawn
-
-            # For display purposes
-            before_display = best_centipawn / 100
-            after_display = move_centipawn / 100
-        else:
-            # Fallback: analyze the position after the move
-            after_analysis = analyzer.analyze_position(after_fen, depth)
-
-            before_eval = (
-                before_analysis["evaluation"]["value"]
-                if before_analysis["evaluation"]["type"] == "cp"
-                else 0
-            )
-            after_eval = (
-                after_analysis["evaluation"]["value"]
-                if after_analysis["evaluation"]["type"] == "cp"
-                else 0
-            )
-
-            # Calculate from moving player's perspective
-            if "b" in fen:  # Black to move
-                eval_change = before_eval - after_eval  # Black wants more negative
-                before_display = -before_eval / 100
-                after_display = -after_eval / 100
-            else:  # White to move
-                eval_change = after_eval - before_eval  # White wants more positive
-                before_display = before_eval / 100
-                after_display = after_eval / 100
+        # Analyze position before move, making sure the played move is scored
+        # alongside the engine's top moves
+        before_analysis = await asyncio.to_thread(
+            analyzer.analyze_position,
+            fen,
+            depth,
+            include_moves=[move_san],
+            board=board,
+            multipv=5,
+        )
 
+        # Get engine's assessment of the move from top_moves
+        move_info = next(
+            move_info
+            for move_info in before_analysis["top_moves"]
+            if move_info["Move"] == move_san
+        )
         # Get engine's top choice
         best_move = before_analysis["best_move"]
         top_moves = before_analysis["top_moves"]
+        best_info = top_moves[0]
+
+        # Mates are scored beyond any material swing, so a move that misses
+        # or allows one rates as a blunder
+        player_score = move_score(move_info, board.turn)
+        best_score = move_score(best_info, board.turn)
+        eval_change = player_score - best_score
+        involves_mate = (
+            move_info.get("Mate") is not None or best_info.get("Mate") is not None
+        )
+        if involves_mate and eval_change:
+            change_text = "decides a forced mate"
+        else:
+            change_text = f"{eval_change/100:+.1f} pawns"
 
         # Rate the move
-        if abs(eval_change) < 20:
-            rating = "Excellent"
-            emoji = "🟢"
-        elif abs(eval_change) < 50:
-            rating = "Good"
-            emoji = "🔵"
-        elif abs(eval_change) < 100:
-            rating = "Questionable"
-            emoji = "🟡"
-        elif abs(eval_change) < 200:
-            rating = "Bad"
-            emoji = "🟠"
-        else:
-            rating = "Blunder"
-            emoji = "🔴"
+        rating, emoji = rate_move(eval_change)
 
-        response = f"""🔍 **Move Evaluation: {move}**
+        parts = [f"""🔍 **Move Evaluation: {move}**
 
 **Rating: {emoji} {rating}**
-• Evaluation change: {eval_change/100:+.1f} pawns
-• Engine evaluation: {before_display:+.1f} → {after_display:+.1f}
+• Evaluation change: {change_text}
+• Engine evaluation: {format_move_score(best_info)} → {format_move_score(move_info)}
 
-**Engine's Assessment:**"""
+**Engine's Assessment:**"""]
 
-        if move == best_move:
-            response += "\n✅ This is the engine's top choice!"
+        if move_san == best_move:
+            parts.append("\n✅ This is the engine's top choice!")
         else:
-            response += f"\n💡 Engine prefers: **{best_move}**"
+            parts.append(f"\n💡 Engine prefers: **{best_move}**")
 
             # Show why the engine's move is better
-            for move_info in top_moves:
-                if move_info["Move"] == move:
-                    player_cp = move_info.get("Centipawn", 0)
-                    best_cp = top_moves[0].get("Centipawn", 0)
-                    if "b" in fen:  # Black to move
-                        diff = player_cp - best_cp
-                    else:
-                        diff = best_cp - player_cp
-                    response += f"\n• Your move: {player_cp/100:+.1f}, Best: {best_cp/100:+.1f} (difference: {diff/100:.1f})"
-                    break
+            diff = player_score - best_score if black_to_move else -eval_change
+            diff_text = "forced mate" if involves_mate and diff else f"{diff/100:.1f}"
+            parts.append(
+                f"\n• Your move: {format_move_score(move_info)}, Best: {format_move_score(best_info)} (difference: {diff_text})"
+            )
 
-        response += """
+        parts.append("""
 
-**📚 Alternative Moves:**"""
+**📚 Alternative Moves:**""")
         for i, move_info in enumerate(top_moves[:5], 1):
             alt_move = move_info["Move"]
-            cp = move_info.get("Centipawn", 0)
-            if alt_move == move:
-                response += f"\n{i}. **{alt_move}** ({cp/100:+.1f}) ← Your move"
+            score_text = format_move_score(move_info)
+            if alt_move == move_san:
+                parts.append(f"\n{i}. **{alt_move}** ({score_text}) ← Your move")
             else:
-                response += f"\n{i}. {alt_move} ({cp/100:+.1f})"
+                parts.append(f"\n{i}. {alt_move} ({score_text})")
 
         # Add tactical/positional feedback
         if rating in ["Bad", "Blunder"]:
-            response += """
+            parts.append(MOVE_IMPROVEMENT_TIPS)
 
-**🚨 Improvement Tips:**
-• Look for tactical motifs (pins, forks, discovered attacks)
-• Consider your opponent's threats before moving
-• Ensure piece safety and coordination
-• Ask: "What does this move accomplish?"""
-
-        response += f"\n\n*Analysis depth: {depth}*"
+        parts.append(f"\n\n*Analysis depth: {depth}*")
 
-        return [TextContent(type="text", text=response)]
+        return [TextContent(type="text", text="".join(parts))]
 
     except Exception as e:
         return [TextContent(type="text", text=f"❌ Evaluation error: {str(e)}")]
 
 
+# Depth of a cached analysis trusted to rule out tactics in a quiet position
+QUIET_PROBE_DEPTH = 18
+
+
+def is_quiet_analysis(analysis: dict, board: chess.Board) -> bool:
+    """Check whether an analysis shows a level position with no forcing moves.
+
+    Level means within half a pawn; forcing means any of the engine's top
+    moves is a capture or a check.
+    """
+    eval_info = analysis["evaluation"]
+    if eval_info["type"] != "cp" or abs(eval_info["value"]) >= 50:
+        return False
+
+    for move_info in analysis["top_moves"]:
+        uci_move = move_info.get("UCI")
+        if uci_move is None:
+            return False
+        move = chess.Move.from_uci(uci_move)
+        if board.is_capture(move) or board.gives_check(move):
+            return False
+
+    return True
+
+
+# Static guidance blocks of the tactical analysis
+TACTICAL_MOTIFS = """
+
+**🧠 Common Tactical Motifs to Look For:**
+• **Pins**: Attack a piece that can't move without exposing a more valuable piece
+• **Forks**: Attack two or more pieces simultaneously
+• **Skewers**: Force a valuable piece to move, exposing a less valuable one
+• **Discovered attacks**: Move one piece to reveal an attack from another
+• **Double attacks**: Attack two targets at once
+• **Deflection**: Force a defending piece away from its duty"""
+
+TACTICAL_TRAINING_TIPS = """
+
+**💡 Tactical Training Tips:**
+• Calculate concrete variations, don't just rely on intuition
+• Always check for opponent's counter-tactics
+• Look for forcing moves: checks, captures, threats
+• Practice tactical puzzles to sharpen your pattern recognition"""
+
+
 async def find_tactical_opportunities(
     arguments: dict, analyzer: ChessAnalyzer
 ) -> list[TextContent]:
@@ -613,176 +621,109 @@ async def find_tactical_opportunities(
         return [TextContent(type="text", text="❌ Please provide a FEN position")]
 
     try:
-        # Analyze with high depth for tactics
-        analysis = analyzer.analyze_position(fen, depth=22)
-
         board = chess.Board(fen)
+
+        # A quiet, level evaluation already cached at depth 18 almost never
+        # hides a tactic, so only search deeper when there is none
+        analysis = analyzer.get_cached_analysis(fen, QUIET_PROBE_DEPTH, board=board)
+        if analysis is None or not is_quiet_analysis(analysis, board):
+            # Analyze with high depth for tactics, stopping once the evaluation settles
+            analysis = await asyncio.to_thread(
+                analyzer.analyze_position_iterative, fen, max_depth=22, board=board
+            )
+
         to_move = "White" if board.turn else "Black"
 
         # Check for immediate tactics
         best_move = analysis["best_move"]
         eval_info = analysis["evaluation"]
 
-        response = f"""⚡ **Tactical Analysis**
+        parts = [f"""⚡ **Tactical Analysis**
 
-**Position for {to_move} to move**"""
+**Position for {to_move} to move**"""]
 
         # Check if there's a forced mate
         if eval_info["type"] == "mate":
             moves_to_mate = abs(eval_info["value"])
             if eval_info["value"] > 0:
-                response += f"\n🎯 **MATE FOUND!** White mates in {moves_to_mate}"
+                parts.append(f"\n🎯 **MATE FOUND!** White mates in {moves_to_mate}")
             else:
-                response += f"\n🎯 **MATE FOUND!** Black mates in {moves_to_mate}"
-            response += f"\nKey move: **{best_move}**"
+                parts.append(f"\n🎯 **MATE FOUND!** Black mates in {moves_to_mate}")
+            parts.append(f"\nKey move: **{best_move}**")
 
         else:
             # Look for significant evaluation swings indicating tactics
             cp_value = eval_info["value"]
-            if abs(cp_value) > 300:
-                response += "\n🎯 **Major Tactical Opportunity!**"
-                response += f"\nEvaluation: {cp_value/100:+.1f} pawns"
-            elif abs(cp_value) > 150:
-                response += "\n⚡ **Tactical Advantage Available**"
-                response += f"\nEvaluation: {cp_value/100:+.1f} pawns"
-            else:
-                response += "\n🔍 **No Major Tactics Found**"
-                response += f"\nPosition is relatively balanced: {cp_value/100:+.1f}"
+            verdict = TACTICAL_VERDICTS[
+                bisect.bisect_left(TACTICAL_BOUNDS, abs(cp_value))
+            ]
+            parts.append(verdict.format(pawns=cp_value / 100))
 
-        response += """
+        parts.append("""
 
-**🎲 Key Moves to Consider:**"""
+**🎲 Key Moves to Consider:**""")
 
         for i, move_info in enumerate(analysis["top_moves"][:3], 1):
             move = move_info["Move"]
-            cp = move_info.get("Centipawn", 0)
+            score_text = format_move_score(move_info)
 
-            # Try to identify move type
-            board_copy = chess.Board(fen)
+            # Try to identify move type on the shared board; the engine's UCI
+            # move needs no SAN parsing and nothing here mutates the board
             try:
-                chess_move = board_copy.parse_san(move)
+                chess_move = chess.Move.from_uci(move_info["UCI"])
 
                 move_type = ""
-                if board_copy.is_capture(chess_move):
+                if board.is_capture(chess_move):
                     move_type += "capture "
-                if board_copy.gives_check(chess_move):
+                if board.gives_check(chess_move):
                     move_type += "check "
                 if chess_move.promotion:
                     move_type += "promotion "
 
-                response += f"\n{i}. **{move}** ({cp/100:+.1f}) {move_type}"
-            except:
-                response += f"\n{i}. **{move}** ({cp/100:+.1f})"
+                parts.append(f"\n{i}. **{move}** ({score_text}) {move_type}")
+            except (KeyError, ValueError):
+                parts.append(f"\n{i}. **{move}** ({score_text})")
 
         # Add tactical motif guidance
-        response += """
-
-**🧠 Common Tactical Motifs to Look For:**
-• **Pins**: Attack a piece that can't move without exposing a more valuable piece
-• **Forks**: Attack two or more pieces simultaneously
-• **Skewers**: Force a valuable piece to move, exposing a less valuable one
-• **Discovered attacks**: Move one piece to reveal an attack from another
-• **Double attacks**: Attack two targets at once
-• **Deflection**: Force a defending piece away from its duty"""
+        parts.append(TACTICAL_MOTIFS)
 
         if eval_info["type"] != "mate" and abs(cp_value) < 100:
-            response += """
-
-**💡 Tactical Training Tips:**
-• Calculate concrete variations, don't just rely on intuition
-• Always check for opponent's counter-tactics
-• Look for forcing moves: checks, captures, threats
-• Practice tactical puzzles to sharpen your pattern recognition"""
+            parts.append(TACTICAL_TRAINING_TIPS)
 
-        return [TextContent(type="text", text=response)]
+        return [TextContent(type="text", text="".join(parts))]
 
     except Exception as e:
         return [TextContent(type="text", text=f"❌ Tactical analysis error: {str(e)}")]
 
 
-async def analyze_opening_position(
-    arguments: dict, analyzer: ChessAnalyzer
-) -> list[TextContent]:
-    """Analyze opening positions and provide strategic guidance."""
-    fen = arguments.get("fen")
-    moves_played = arguments.get("moves_played", [])
-
-    if not fen:
-        return [TextContent(type="text", text="❌ Please provide a FEN position")]
-
-    try:
-        analysis = analyzer.analyze_position(fen, depth=18)
-
-        board = chess.Board(fen)
-        move_number = board.fullmove_number
-        to_move = "White" if board.turn else "Black"
-
-        # Format evaluation properly
-        eval_info = analysis["evaluation"]
-        if eval_info["type"] == "cp":
-            eval_text = f"{eval_info['value']/100:+.1f} pawns"
-        else:
-            moves = eval_info["value"]
-            side = "White" if moves > 0 else "Black"
-            eval_text = f"Mate in {abs(moves)} for {side}"
-
-        response = f"""📚 **Opening Analysis**
-
-**Position Info:**
-• Move {move_number}, {to_move} to move
-• Evaluation: {eval_text}"""
-
-        if moves_played:
-            response += f"\n• Opening line: {' '.join(moves_played[:8])}{'...' if len(moves_played) > 8 else ''}"
-
-        response += """
-
-**🎯 Recommended Moves:**"""
-
-        for i, move_info in enumerate(analysis["top_moves"][:3], 1):
-            move = move_info["Move"]
-            cp = move_info.get("Centipawn", 0)
-            response += f"\n{i}. **{move}** ({cp/100:+.1f})"
-
-        # Opening principles based on move number
-        if move_number <= 5:
-            response += """
+# Opening principles by move number: up to move 5, up to move 10 and
+# beyond, looked up by bisecting the move number into OPENING_STAGE_BOUNDS
+OPENING_STAGE_BOUNDS = (5, 10)
+OPENING_STAGE_GUIDANCE = (
+    """
 
 **🏗️ Early Opening Principles (Moves 1-5):**
 • **Development**: Bring knights and bishops into active squares
 • **Center Control**: Fight for central squares (e4, e5, d4, d5)
 • **King Safety**: Castle early to protect your king
-• **Avoid**: Moving the same piece twice, bringing queen out too early"""
-
-        elif move_number <= 10:
-            response += """
+• **Avoid**: Moving the same piece twice, bringing queen out too early""",
+    """
 
 **⚔️ Opening Development (Moves 6-10):**
 • **Complete development**: Get all minor pieces active
 • **Castle if you haven't**: King safety is priority
 • **Connect rooks**: Clear the back rank
-• **Central pawn breaks**: Look for d4/d5 or e4/e5 advances"""
-
-        else:
-            response += """
+• **Central pawn breaks**: Look for d4/d5 or e4/e5 advances""",
+    """
 
 **🌟 Opening to Middlegame Transition:**
 • **Piece improvement**: Optimize piece placement
 • **Pawn structure**: Consider pawn breaks and weaknesses
 • **Planning**: Identify strategic goals and piece coordination
-• **Tactics**: Stay alert for tactical opportunities"""
+• **Tactics**: Stay alert for tactical opportunities""",
+)
 
-        # Add piece development analysis
-        piece_analysis = analyze_piece_development(board)
-        response += """
-
-**🎭 Piece Activity Assessment:**"""
-        for color, info in piece_analysis.items():
-            response += f"\n• **{color}**: {info['developed']}/8 pieces developed"
-            if info["suggestions"]:
-                response += f" | Next: {', '.join(info['suggestions'])}"
-
-        response += """
+OPENING_STRATEGIC_TIPS = """
 
 **💡 Strategic Tips:**
 • Control key squares with pieces, not just pawns
@@ -790,85 +731,101 @@ async def analyze_opening_position(
 • Don't rush attacks without proper preparation
 • Study master games from this opening structure"""
 
-        return [TextContent(type="text", text=response)]
 
-    except Exception as e:
-        return [TextContent(type="text", text=f"❌ Opening analysis error: {str(e)}")]
-
-
-async def provide_endgame_guidance(
+async def analyze_opening_position(
     arguments: dict, analyzer: ChessAnalyzer
 ) -> list[TextContent]:
-    """Provide endgame guidance and technique."""
+    """Analyze opening positions and provide strategic guidance."""
     fen = arguments.get("fen")
+    moves_played = arguments.get("moves_played", [])
 
     if not fen:
         return [TextContent(type="text", text="❌ Please provide a FEN position")]
 
     try:
-        analysis = analyzer.analyze_position(
-            fen, depth=25
-        )  # Deep analysis for endgames
-
         board = chess.Board(fen)
-        piece_count = len(
-            [p for p in board.piece_map().values() if p.piece_type != chess.KING]
+        analysis = await asyncio.to_thread(
+            analyzer.analyze_position, fen, depth=18, board=board
         )
 
+        move_number = board.fullmove_number
+        to_move = "White" if board.turn else "Black"
+
+        # Format evaluation properly
         eval_info = analysis["evaluation"]
-        if eval_info["type"] == "cp":
-            eval_text = f"{eval_info['value']/100:+.1f} pawns"
-        else:
-            moves = eval_info["value"]
-            side = "White" if moves > 0 else "Black"
-            eval_text = f"Mate in {abs(moves)} for {side}"
+        eval_text = format_evaluation(eval_info["type"], eval_info["value"])
 
-        response = f"""🏁 **Endgame Guidance**
+        parts = [f"""📚 **Opening Analysis**
 
-**Position Assessment:**
-• Material: {piece_count} pieces on board (excluding kings)
-• Evaluation: {eval_text}
-• Best move: **{analysis['best_move']}**
+**Position Info:**
+• Move {move_number}, {to_move} to move
+• Evaluation: {eval_text}"""]
 
-**🎯 Key Moves:**"""
+        if moves_played:
+            parts.append(
+                f"\n• Opening line: {' '.join(moves_played[:8])}{'...' if len(moves_played) > 8 else ''}"
+            )
+
+        parts.append("""
+
+**🎯 Recommended Moves:**""")
 
         for i, move_info in enumerate(analysis["top_moves"][:3], 1):
             move = move_info["Move"]
-            cp = move_info.get("Centipawn", 0)
-            response += f"\n{i}. **{move}** ({cp/100:+.1f})"
+            parts.append(f"\n{i}. **{move}** ({format_move_score(move_info)})")
 
-        # Endgame-specific guidance based on material
-        material_balance = analyze_endgame_material(board)
+        # Opening principles based on move number
+        parts.append(
+            OPENING_STAGE_GUIDANCE[
+                bisect.bisect_left(OPENING_STAGE_BOUNDS, move_number)
+            ]
+        )
 
-        if "K+P vs K" in material_balance:
-            response += """
+        # Add piece development analysis
+        piece_analysis = analyze_piece_development(board)
+        parts.append("""
+
+**🎭 Piece Activity Assessment:**""")
+        for color, info in piece_analysis.items():
+            parts.append(f"\n• **{color}**: {info['developed']}/8 pieces developed")
+            if info["suggestions"]:
+                parts.append(f" | Next: {', '.join(info['suggestions'])}")
+
+        parts.append(OPENING_STRATEGIC_TIPS)
+
+        return [TextContent(type="text", text="".join(parts))]
+
+    except Exception as e:
+        return [TextContent(type="text", text=f"❌ Opening analysis error: {str(e)}")]
+
+
+# Technique for the basic endgames, by material description from
+# analyze_endgame_material
+ENDGAME_GUIDANCE = {
+    "K+P vs K": """
 
 **♔ King and Pawn Endgame:**
 • **Opposition**: Control key squares to restrict opponent's king
 • **Key squares**: Calculate which squares your king must reach
 • **Pawn promotion**: Support your pawn's advance to the 8th rank
-• **Stalemate tricks**: Be careful not to stalemate in winning positions"""
-
-        elif "K+Q vs K" in material_balance:
-            response += """
+• **Stalemate tricks**: Be careful not to stalemate in winning positions""",
+    "K+Q vs K": """
 
 **♕ Queen vs King Endgame:**
 • **Centralize your king**: Bring it up to help the queen
 • **Cut off escape**: Use queen to limit opponent king's mobility
 • **Avoid stalemate**: Give the opponent king legal moves
-• **Basic checkmate**: Learn the systematic mating technique"""
-
-        elif "K+R vs K" in material_balance:
-            response += """
+• **Basic checkmate**: Learn the systematic mating technique""",
+    "K+R vs K": """
 
 **♖ Rook vs King Endgame:**
 • **Cut off the king**: Use rook to confine opponent to edge
 • **Box method**: Systematically reduce the king's space
 • **Avoid stalemate**: Keep opponent's king mobile until mate
-• **King activity**: Your king must participate in the mating attack"""
+• **King activity**: Your king must participate in the mating attack""",
+}
 
-        else:
-            response += """
+GENERAL_ENDGAME_GUIDANCE = """
 
 **🎓 General Endgame Principles:**
 • **King activity**: The king becomes a fighting piece
@@ -876,8 +833,7 @@ async def provide_endgame_guidance(
 • **Piece coordination**: Work pieces together harmoniously
 • **Calculate precisely**: Endgames reward accurate calculation"""
 
-        # Add practical guidance
-        response += """
+ENDGAME_PRACTICAL_TIPS = """
 
 **💪 Practical Tips:**
 • **Opposition**: In pawn endings, try to get the opposition
@@ -891,86 +847,292 @@ async def provide_endgame_guidance(
 • Study rook endgames - they're the most common
 • Master piece vs pawn endings for practical play"""
 
-        return [TextContent(type="text", text=response)]
+
+async def provide_endgame_guidance(
+    arguments: dict, analyzer: ChessAnalyzer
+) -> list[TextContent]:
+    """Provide endgame guidance and technique."""
+    fen = arguments.get("fen")
+
+    if not fen:
+        return [TextContent(type="text", text="❌ Please provide a FEN position")]
+
+    try:
+        board = chess.Board(fen)
+        analysis = await asyncio.to_thread(
+            analyzer.analyze_position, fen, depth=25, board=board
+        )  # Deep analysis for endgames
+
+        piece_count = chess.popcount(board.occupied & ~board.kings)
+
+        eval_info = analysis["evaluation"]
+        eval_text = format_evaluation(eval_info["type"], eval_info["value"])
+
+        parts = [f"""🏁 **Endgame Guidance**
+
+**Position Assessment:**
+• Material: {piece_count} pieces on board (excluding kings)
+• Evaluation: {eval_text}
+• Best move: **{analysis['best_move']}**
+
+**🎯 Key Moves:**"""]
+
+        for i, move_info in enumerate(analysis["top_moves"][:3], 1):
+            move = move_info["Move"]
+            parts.append(f"\n{i}. **{move}** ({format_move_score(move_info)})")
+
+        # Endgame-specific guidance based on material
+        material_balance = analyze_endgame_material(board)
+
+        parts.append(ENDGAME_GUIDANCE.get(material_balance, GENERAL_ENDGAME_GUIDANCE))
+
+        # Add practical guidance
+        parts.append(ENDGAME_PRACTICAL_TIPS)
+
+        return [TextContent(type="text", text="".join(parts))]
 
     except Exception as e:
         return [TextContent(type="text", text=f"❌ Endgame analysis error: {str(e)}")]
 
 
+@lru_cache(maxsize=8192)
+def san_to_uci(epd: str, san: str) -> str:
+    """Resolve a SAN move in the position given as EPD to UCI.
+
+    Cached, since the same moves tend to be asked about in the same
+    positions across requests.
+    """
+    board = chess.Board(epd)
+    return board.parse_san(san).uci()
+
+
+def game_phase(board: chess.Board) -> str:
+    """Classify the game phase by the number of pieces on the board."""
+    piece_count = chess.popcount(board.occupied)
+
+    if piece_count <= 10:
+        return "Endgame"
+    elif piece_count <= 20:
+        return "Middlegame"
+    else:
+        return "Opening"
+
+
+# Advantage labels for evaluations of at least 50 centipawns, looked up by
+# bisecting the absolute evaluation into ADVANTAGE_BOUNDS
+ADVANTAGE_BOUNDS = (100, 300)
+ADVANTAGE_LABELS = (
+    "Slight advantage",
+    "Clear advantage for {side}",
+    "Winning advantage for {side}",
+)
+
+# Move ratings by centipawn loss, looked up by bisecting into MOVE_RATING_BOUNDS
+MOVE_RATING_BOUNDS = (20, 50, 100, 200)
+MOVE_RATINGS = (
+    ("Excellent", "🟢"),
+    ("Good", "🔵"),
+    ("Questionable", "🟡"),
+    ("Bad", "🟠"),
+    ("Blunder", "🔴"),
+)
+
+
+# Candidate move quality by centipawn loss, looked up by bisecting into
+# MOVE_QUALITY_BOUNDS
+MOVE_QUALITY_BOUNDS = (25, 60, 120, 250)
+MOVE_QUALITY_LABELS = (
+    "🟢 Excellent",
+    "🔵 Good",
+    "🟡 Questionable",
+    "🟠 Poor",
+    "🔴 Blunder",
+)
+
+# Tactical verdicts for evaluations up to 1.5 pawns, up to 3 and beyond,
+# looked up by bisecting the absolute evaluation into TACTICAL_BOUNDS
+TACTICAL_BOUNDS = (150, 300)
+TACTICAL_VERDICTS = (
+    "\n🔍 **No Major Tactics Found**\nPosition is relatively balanced: {pawns:+.1f}",
+    "\n⚡ **Tactical Advantage Available**\nEvaluation: {pawns:+.1f} pawns",
+    "\n🎯 **Major Tactical Opportunity!**\nEvaluation: {pawns:+.1f} pawns",
+)
+
+# Variation verdicts by the evaluation change over the variation, looked up by
+# bisecting the change in centipawns into VARIATION_QUALITY_BOUNDS: a drop of
+# more than a pawn, exactly a pawn, 30 to 99 centipawns, under 30 either way,
+# 30 to 99 up, exactly a pawn up, and more than a pawn up
+VARIATION_QUALITY_BOUNDS = (-100, -99, -29, 30, 100, 101)
+VARIATION_QUALITY_LABELS = {
+    side: (
+        falling,
+        "🔴 Major advantage shift",
+        "🟡 Slight advantage",
+        "🟢 Balanced",
+        "🟡 Slight advantage",
+        "🔴 Major advantage shift",
+        rising,
+    )
+    for side, rising, falling in (
+        (chess.WHITE, "🔵 Good for White", "🟡 Good for Black"),
+        (chess.BLACK, "🔵 Good for current player", "🟡 Good for opponent"),
+    )
+}
+
+
+def describe_evaluation(centipawns: int) -> str:
+    """Describe a centipawn evaluation given from White's perspective."""
+    if abs(centipawns) < 50:
+        return "Equal position"
+
+    side = "White" if centipawns > 0 else "Black"
+    label = ADVANTAGE_LABELS[bisect.bisect_left(ADVANTAGE_BOUNDS, abs(centipawns))]
+    return label.format(side=side)
+
+
+# Evaluations repeat a lot across positions and lines, so their display
+# strings are cached
+@lru_cache(maxsize=4096)
+def format_evaluation(eval_type: str, value: int, unit: str = " pawns") -> str:
+    """Format an engine evaluation given from White's perspective."""
+    if eval_type == "cp":
+        return f"{value/100:+.1f}{unit}"
+    if eval_type == "mate":
+        side = "White" if value > 0 else "Black"
+        return f"Mate in {abs(value)} for {side}"
+    return "Unknown"
+
+
+# Centipawn stand-in for a forced mate when comparing move scores, beyond
+# any material advantage so that missing or allowing a mate rates as a blunder
+MATE_CENTIPAWNS = 10000
+
+
+def move_score(move_info: dict, mover: chess.Color) -> int:
+    """Score a top-moves entry in centipawns from White's perspective.
+
+    A forced mate counts as MATE_CENTIPAWNS for the side delivering it. A mate
+    score of 0 means the move itself mates, which favors the side playing it.
+    """
+    mate = move_info.get("Mate")
+    if mate is None:
+        return move_info.get("Centipawn") or 0
+    white_mates = mate > 0 if mate else mover == chess.WHITE
+    return MATE_CENTIPAWNS if white_mates else -MATE_CENTIPAWNS
+
+
+def format_move_score(move_info: dict) -> str:
+    """Format a top-moves entry's score, showing mates as such."""
+    mate = move_info.get("Mate")
+    if mate is None:
+        return format_evaluation("cp", move_info.get("Centipawn") or 0, "")
+    if mate == 0:
+        return "Checkmate"
+    return format_evaluation("mate", mate)
+
+
+def rate_move(eval_change: int) -> tuple[str, str]:
+    """Rate a move by how far its evaluation is from the best move."""
+    return MOVE_RATINGS[bisect.bisect_right(MOVE_RATING_BOUNDS, abs(eval_change))]
+
+
+def classify_move_quality(eval_change: int) -> str:
+    """Label a candidate move by how much evaluation it gives up."""
+    return MOVE_QUALITY_LABELS[
+        bisect.bisect_right(MOVE_QUALITY_BOUNDS, abs(eval_change))
+    ]
+
+
+def classify_variation(total_change: int, turn: chess.Color) -> str:
+    """Label a variation by how much it changes the evaluation."""
+    return VARIATION_QUALITY_LABELS[turn][
+        bisect.bisect_right(VARIATION_QUALITY_BOUNDS, total_change)
+    ]
+
+
+# Starting squares of the minor pieces as bitboards, by color and piece type
+HOME_SQUARES = {
+    chess.WHITE: {
+        chess.KNIGHT: chess.BB_B1 | chess.BB_G1,
+        chess.BISHOP: chess.BB_C1 | chess.BB_F1,
+    },
+    chess.BLACK: {
+        chess.KNIGHT: chess.BB_B8 | chess.BB_G8,
+        chess.BISHOP: chess.BB_C8 | chess.BB_F8,
+    },
+}
+
+# Starting squares of both kinds of minor piece together, by color
+MINOR_HOME_SQUARES = {
+    color: home[chess.KNIGHT] | home[chess.BISHOP]
+    for color, home in HOME_SQUARES.items()
+}
+
+# Files of a king that has castled: g-file (short) or c-file (long)
+CASTLED_KING_FILES = frozenset({6, 2})
+
+# Suggested developing moves for a knight still on its starting square
+KNIGHT_DEVELOPMENT = {
+    chess.B1: "Nc3 or Nd2",
+    chess.G1: "Nf3 or Ne2",
+    chess.B8: "Nc6 or Nd7",
+    chess.G8: "Nf6 or Ne7",
+}
+
+
 def analyze_piece_development(board: chess.Board) -> dict:
     """Analyze piece development for both sides."""
-    result = {}
+    developed = {}
+    suggestions = {}
+
+    for color, home in HOME_SQUARES.items():
+        knights = board.knights & board.occupied_co[color]
+        bishops = board.bishops & board.occupied_co[color]
+        developed[color] = chess.popcount(
+            knights & ~home[chess.KNIGHT]
+        ) + chess.popcount(bishops & ~home[chess.BISHOP])
+        suggestions[color] = [
+            KNIGHT_DEVELOPMENT[square]
+            for square in chess.scan_forward(knights & home[chess.KNIGHT])
+        ]
 
-    for color in [chess.WHITE, chess.BLACK]:
-        color_name = "White" if color == chess.WHITE else "Black"
-        developed = 0
-        suggestions = []
-
-        # Check knights
-        knights = board.pieces(chess.KNIGHT, color)
-        for knight_square in knights:
-            if color == chess.WHITE:
-                if knight_square not in [chess.B1, chess.G1]:
-                    developed += 1
-                elif knight_square == chess.B1:
-                    suggestions.append("Nc3 or Nd2")
-                elif knight_square == chess.G1:
-                    suggestions.append("Nf3 or Ne2")
-            else:
-                if knight_square not in [chess.B8, chess.G8]:
-                    developed += 1
-                elif knight_square == chess.B8:
-                    suggestions.append("Nc6 or Nd7")
-                elif knight_square == chess.G8:
-                    suggestions.append("Nf6 or Ne7")
-
-        # Check bishops
-        bishops = board.pieces(chess.BISHOP, color)
-        for bishop_square in bishops:
-            if color == chess.WHITE:
-                if bishop_square not in [chess.C1, chess.F1]:
-                    developed += 1
-            else:
-                if bishop_square not in [chess.C8, chess.F8]:
-                    developed += 1
+    return {
+        "White": {
+            "developed": developed[chess.WHITE],
+            "suggestions": suggestions[chess.WHITE][:2],  # Limit suggestions
+        },
+        "Black": {
+            "developed": developed[chess.BLACK],
+            "suggestions": suggestions[chess.BLACK][:2],
+        },
+    }
 
-        result[color_name] = {
-            "developed": developed,
-            "suggestions": suggestions[:2],  # Limit suggestions
-        }
 
-    return result
+# Basic endgames with a single piece against a bare king, by piece type
+LONE_PIECE_ENDGAMES = {chess.PAWN: "P", chess.QUEEN: "Q", chess.ROOK: "R"}
 
 
 def analyze_endgame_material(board: chess.Board) -> str:
     """Analyze material balance for endgame classification."""
-    white_pieces = []
-    black_pieces = []
-
-    for piece_type in [chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT, chess.PAWN]:
-        white_count = len(board.pieces(piece_type, chess.WHITE))
-        black_count = len(board.pieces(piece_type, chess.BLACK))
-
-        if white_count > 0:
-            white_pieces.extend([chess.piece_name(piece_type).upper()] * white_count)
-        if black_count > 0:
-            black_pieces.extend([chess.piece_name(piece_type).upper()] * black_count)
+    white_pieces = board.occupied_co[chess.WHITE] & ~board.kings
+    black_pieces = board.occupied_co[chess.BLACK] & ~board.kings
+    white_count = chess.popcount(white_pieces)
+    black_count = chess.popcount(black_pieces)
 
     # Simple material description
-    if len(white_pieces) == 1 and len(black_pieces) == 0 and white_pieces[0] == "P":
-        return "K+P vs K"
-    elif len(white_pieces) == 1 and len(black_pieces) == 0 and white_pieces[0] == "Q":
-        return "K+Q vs K"
-    elif len(white_pieces) == 1 and len(black_pieces) == 0 and white_pieces[0] == "R":
-        return "K+R vs K"
-    elif len(black_pieces) == 1 and len(white_pieces) == 0 and black_pieces[0] == "P":
-        return "K vs K+P"
-    elif len(black_pieces) == 1 and len(white_pieces) == 0 and black_pieces[0] == "Q":
-        return "K vs K+Q"
-    elif len(black_pieces) == 1 and len(white_pieces) == 0 and black_pieces[0] == "R":
-        return "K vs K+R"
-    else:
-        return f"Complex endgame ({len(white_pieces)+len(black_pieces)} pieces)"
+    if white_count == 1 and black_count == 0:
+        lone_piece = LONE_PIECE_ENDGAMES.get(
+            board.piece_type_at(chess.lsb(white_pieces))
+        )
+        if lone_piece:
+            return f"K+{lone_piece} vs K"
+    elif black_count == 1 and white_count == 0:
+        lone_piece = LONE_PIECE_ENDGAMES.get(
+            board.piece_type_at(chess.lsb(black_pieces))
+        )
+        if lone_piece:
+            return f"K vs K+{lone_piece}"
+    return f"Complex endgame ({white_count + black_count} pieces)"
 
 
 async def explore_candidate_moves(
@@ -980,6 +1142,7 @@ async def explore_candidate_moves(
     fen = arguments.get("fen")
     candidate_moves = arguments.get("candidate_moves", [])
     depth = arguments.get("depth", 18)
+    include_engine_response = arguments.get("include_engine_response", False)
 
     if not fen:
         return [TextContent(type="text", text="❌ Please provide a FEN position")]
@@ -995,24 +1158,9 @@ async def explore_candidate_moves(
         board = chess.Board(fen)
         to_move = "White" if board.turn else "Black"
 
-        # First analyze the starting position
-        start_analysis = analyzer.analyze_position(fen, depth)
-        start_eval = (
-            start_analysis["evaluation"]["value"]
-            if start_analysis["evaluation"]["type"] == "cp"
-            else 0
-        )
-
-        response = f"""🧪 **Move Exploration Results**
-
-**Starting Position ({to_move} to move):**
-• Evaluation: {start_eval/100:+.1f} pawns
-• Engine's top choice: **{start_analysis['best_move']}**
-
-**🔍 Candidate Move Analysis:**"""
-
-        move_results = []
-
+        # Play every candidate first so the resulting positions can be
+        # analyzed as one parallel batch
+        candidates = []
         for i, move in enumerate(candidate_moves, 1):
             try:
                 # Create a copy of the board to test the move
@@ -1023,129 +1171,219 @@ async def explore_candidate_moves(
                     chess_move = test_board.parse_san(move)
 
                     # Check if move is legal
-                    if chess_move not in test_board.legal_moves:
-                        response += f"\n\n**{i}. {move}** ❌ ILLEGAL MOVE"
+                    if not test_board.is_legal(chess_move):
+                        candidates.append((i, move, "❌ ILLEGAL MOVE"))
                         continue
 
-                    # First try to get evaluation from engine's top_moves analysis
-                    move_centipawn = None
-                    for move_info in start_analysis["top_moves"]:
-                        if move_info["Move"] == move:
-                            move_centipawn = move_info.get("Centipawn")
-                            break
-
-                    if move_centipawn is not None:
-                        # Use engine's direct evaluation
-                        best_centipawn = start_analysis["top_moves"][0].get(
-                            "Centipawn", 0
-                        )
-                        eval_change = move_centipawn - best_centipawn
-                        result_eval = move_centipawn
-                    else:
-                        # Fallback: analyze the position after making the move
-                        test_board.push(chess_move)
-                        resulting_fen = test_board.fen()
-                        result_analysis = analyzer.analyze_position(
-                            resulting_fen, depth
-                        )
-                        result_eval = (
-                            result_analysis["evaluation"]["value"]
-                            if result_analysis["evaluation"]["type"] == "cp"
-                            else 0
-                        )
-
-                        # Calculate evaluation change from moving player's perspective
-                        if not board.turn:  # Black to move
-                            eval_change = start_eval - (
-                                -result_eval
-                            )  # Black wants more negative
-                        else:  # White to move
-                            eval_change = (
-                                result_eval - start_eval
-                            )  # White wants more positive
-
-                    # Always get the resulting FEN and analysis for display
-                    if move_centipawn is not None:
-                        test_board.push(chess_move)
-                        resulting_fen = test_board.fen()
-                        # Get analysis for the engine response
-                        result_analysis = analyzer.analyze_position(
-                            resulting_fen, depth
-                        )
-
-                    # Determine move quality
-                    if abs(eval_change) < 25:
-                        quality = "🟢 Excellent"
-                    elif abs(eval_change) < 60:
-                        quality = "🔵 Good"
-                    elif abs(eval_change) < 120:
-                        quality = "🟡 Questionable"
-                    elif abs(eval_change) < 250:
-                        quality = "🟠 Poor"
-                    else:
-                        quality = "🔴 Blunder"
-
-                    # Check for special move properties
-                    move_properties = []
-                    if board.is_capture(chess_move):
-                        captured_piece = board.piece_at(chess_move.to_square)
-                        move_properties.append(
-                            f"captures {chess.piece_name(captured_piece.piece_type) if captured_piece else 'piece'}"
-                        )
-                    if board.gives_check(chess_move):
-                        move_properties.append("gives check")
-                    if chess_move.promotion:
-                        move_properties.append(
-                            f"promotes to {chess.piece_name(chess_move.promotion)}"
-                        )
-                    if test_board.is_checkmate():
-                        move_properties.append("CHECKMATE!")
-                    elif test_board.is_stalemate():
-                        move_properties.append("stalemate")
-
-                    move_info = {
-                        "move": move,
-                        "quality": quality,
-                        "eval_change": eval_change,
-                        "result_eval": result_eval,
-                        "properties": move_properties,
-                        "resulting_fen": resulting_fen,
-                        "engine_response": result_analysis["best_move"],
-                    }
-                    move_results.append(move_info)
-
-                    # Add to response
-                    props_text = (
-                        f" ({', '.join(move_properties)})" if move_properties else ""
-                    )
-                    response += f"\n\n**{i}. {move}** {quality}{props_text}"
-                    response += f"\n• Evaluation: {start_eval/100:+.1f} → {result_eval/100:+.1f} (change: {eval_change/100:+.1f})"
-                    response += f"\n• After this move, engine suggests: **{result_analysis['best_move']}**"
-                    response += f"\n• Resulting FEN: `{resulting_fen}`"
+                    san = test_board.san(chess_move)
+                    test_board.push(chess_move)
+                    candidates.append((i, move, (chess_move, test_board, san)))
 
                 except ValueError as ve:
-                    response += f"\n\n**{i}. {move}** ❌ INVALID MOVE - {str(ve)}"
+                    candidates.append((i, move, f"❌ INVALID MOVE - {str(ve)}"))
                 except Exception as me:
-                    response += f"\n\n**{i}. {move}** ❌ ERROR - {str(me)}"
+                    candidates.append((i, move, f"❌ ERROR - {str(me)}"))
 
             except Exception as e:
-                response += f"\n\n**{i}. {move}** ❌ ANALYSIS ERROR - {str(e)}"
+                candidates.append((i, move, f"❌ ANALYSIS ERROR - {str(e)}"))
+
+        start_analysis = await asyncio.to_thread(
+            analyzer.analyze_position, fen, depth, board=board
+        )
+        # Ranked moves are measured against the engine's best line. A mated or
+        # stalemated root has no lines, and a mate in the best line has no
+        # centipawn score; the candidates then fall back to searching their
+        # resulting positions instead.
+        top_moves = start_analysis["top_moves"]
+        best_centipawn = top_moves[0].get("Centipawn") if top_moves else None
+        if best_centipawn is None:
+            ranked_centipawns = {}
+        else:
+            ranked_centipawns = {
+                move_info["Move"]: move_info["Centipawn"]
+                for move_info in top_moves
+                if move_info.get("Centipawn") is not None
+            }
+
+        # Moves the engine ranked already have an evaluation; only the others
+        # need their resulting position searched at full depth. The engine's
+        # reply is display-only, so the ranked moves get it from a much
+        # shallower search, and only when asked for.
+        played = [
+            (i, outcome[1], outcome[2])
+            for i, _, outcome in candidates
+            if isinstance(outcome, tuple)
+        ]
+        unranked = [
+            (i, test_board)
+            for i, test_board, san in played
+            if san not in ranked_centipawns
+        ]
+        ranked = [
+            (i, test_board)
+            for i, test_board, san in played
+            if include_engine_response and san in ranked_centipawns
+        ]
+        unranked_analyses, ranked_analyses = await asyncio.gather(
+            asyncio.to_thread(
+                analyzer.analyze_many,
+                [test_board.fen() for _, test_board in unranked],
+                depth,
+                boards=[test_board for _, test_board in unranked],
+                multipv=1,
+            ),
+            asyncio.to_thread(
+                analyzer.analyze_many,
+                [test_board.fen() for _, test_board in ranked],
+                max(6, depth - 8),
+                boards=[test_board for _, test_board in ranked],
+                multipv=1,
+            ),
+        )
+
+        # Analyses by candidate number, so a candidate that fails below
+        # cannot shift the results of the ones after it
+        result_analyses = {
+            i: analysis
+            for (i, _), analysis in itertools.chain(
+                zip(unranked, unranked_analyses), zip(ranked, ranked_analyses)
+            )
+        }
+
+        start_eval = (
+            start_analysis["evaluation"]["value"]
+            if start_analysis["evaluation"]["type"] == "cp"
+            else 0
+        )
+
+        # The header, each candidate and the summary go out as separate
+        # content blocks, so no single report string has to be assembled
+        contents = [
+            TextContent(
+                type="text",
+                text=f"""🧪 **Move Exploration Results**
+
+**Starting Position ({to_move} to move):**
+• Evaluation: {start_eval/100:+.1f} pawns
+• Engine's top choice: **{start_analysis['best_move']}**
+
+**🔍 Candidate Move Analysis:**""",
+            )
+        ]
+
+        move_results = []
+
+        for i, move, outcome in candidates:
+            if isinstance(outcome, str):
+                contents.append(
+                    TextContent(type="text", text=f"**{i}. {move}** {outcome}")
+                )
+                continue
+
+            # Evaluate each candidate on its own, so one failure only marks
+            # that candidate instead of failing the whole exploration
+            try:
+                chess_move, test_board, san = outcome
+                resulting_fen = test_board.fen()
+                move_centipawn = ranked_centipawns.get(san)
+                result_analysis = result_analyses.get(i)
+
+                if move_centipawn is not None:
+                    # Use engine's direct evaluation
+                    eval_change = move_centipawn - best_centipawn
+                    result_eval = move_centipawn
+                else:
+                    # Fallback: use the analysis of the position after the move
+                    result_eval = (
+                        result_analysis["evaluation"]["value"]
+                        if result_analysis["evaluation"]["type"] == "cp"
+                        else 0
+                    )
+
+                    # Calculate evaluation change from moving player's perspective
+                    if not board.turn:  # Black to move
+                        eval_change = start_eval - (
+                            -result_eval
+                        )  # Black wants more negative
+                    else:  # White to move
+                        eval_change = (
+                            result_eval - start_eval
+                        )  # White wants more positive
+
+                # Determine move quality
+                quality = classify_move_quality(eval_change)
+
+                # Check for special move properties
+                move_properties = []
+                if board.is_capture(chess_move):
+                    captured_piece = board.piece_at(chess_move.to_square)
+                    move_properties.append(
+                        f"captures {chess.piece_name(captured_piece.piece_type) if captured_piece else 'piece'}"
+                    )
+                # The SAN suffix already tells check and mate apart, so legal
+                # moves only need generating to spot a stalemate
+                gives_check = san[-1] in "+#"
+                if gives_check:
+                    move_properties.append("gives check")
+                if chess_move.promotion:
+                    move_properties.append(
+                        f"promotes to {chess.piece_name(chess_move.promotion)}"
+                    )
+                if san[-1] == "#":
+                    move_properties.append("CHECKMATE!")
+                elif not gives_check and not any(test_board.legal_moves):
+                    move_properties.append("stalemate")
+
+                move_info = {
+                    "move": move,
+                    "quality": quality,
+                    "eval_change": eval_change,
+                    "result_eval": result_eval,
+                    "properties": move_properties,
+                    "resulting_fen": resulting_fen,
+                    "engine_response": (
+                        result_analysis["best_move"] if result_analysis else None
+                    ),
+                }
+                move_results.append(move_info)
+
+                # Add to response
+                props_text = (
+                    f" ({', '.join(move_properties)})" if move_properties else ""
+                )
+                parts = [f"**{i}. {move}** {quality}{props_text}"]
+                parts.append(
+                    f"\n• Evaluation: {start_eval/100:+.1f} → {result_eval/100:+.1f} (change: {eval_change/100:+.1f})"
+                )
+                if result_analysis:
+                    parts.append(
+                        f"\n• After this move, engine suggests: **{result_analysis['best_move']}**"
+                    )
+                parts.append(f"\n• Resulting FEN: `{resulting_fen}`")
+                contents.append(TextContent(type="text", text="".join(parts)))
+            except Exception as me:
+                contents.append(
+                    TextContent(
+                        type="text", text=f"**{i}. {move}** ❌ ERROR - {str(me)}"
+                    )
+                )
 
         # Add summary and recommendations
+        parts = []
         if move_results:
             # Sort moves by evaluation
             move_results.sort(
                 key=lambda x: -x["eval_change"] if board.turn else x["eval_change"]
             )
 
-            response += """
+            parts.append("""**📊 Summary & Recommendations:**
 
-**📊 Summary & Recommendations:**
-
-**Best Moves (by engine evaluation):**"""
+**Best Moves (by engine evaluation):**""")
 
             for i, move_info in enumerate(move_results[:5], 1):
-                response += f"\n{i}. **{move_info['move']}** ({move_info['eval_change']/100:+.1f})"
+                parts.append(
+                    f"\n{i}. **{move_info['move']}** ({move_info['eval_change']/100:+.1f})"
+                )
 
             # Compare with engine's original suggestion
             engine_choice = start_analysis["best_move"]
@@ -1154,30 +1392,44 @@ async def explore_candidate_moves(
             )
 
             if not user_tested_engine_choice and engine_choice:
-                response += f"""
+                parts.append(f"""
 
 **💡 Engine's Top Choice:** {engine_choice} (not tested in your candidates)
-Consider exploring the engine's suggestion to see why it's preferred."""
+Consider exploring the engine's suggestion to see why it's preferred.""")
 
             # Add learning insights
-            response += """
+            parts.append("""
 
 **🧠 Chess Learning Insights:**
 • Compare evaluations to understand which moves improve your position
 • Look for moves that create immediate threats or solve problems
 • Notice patterns: captures, checks, and development often score well
-• Use resulting FENs to analyze deeper if needed"""
+• Use resulting FENs to analyze deeper if needed""")
 
-        response += (
-            f"\n\n*Analysis depth: {depth} • {len(candidate_moves)} moves explored*"
+            parts.append("\n\n")
+
+        parts.append(
+            f"*Analysis depth: {depth} • {len(candidate_moves)} moves explored*"
         )
+        contents.append(TextContent(type="text", text="".join(parts)))
 
-        return [TextContent(type="text", text=response)]
+        return contents
 
     except Exception as e:
         return [TextContent(type="text", text=f"❌ Move exploration error: {str(e)}")]
 
 
+# Section headings of the categorized legal move list, in display order
+MOVE_CATEGORY_HEADINGS = (
+    ("captures", "⚔️ Captures"),
+    ("checks", "👑 Checks"),
+    ("castling", "🏰 Castling"),
+    ("en_passant", "🎯 En Passant"),
+    ("promotions", "👑 Promotions"),
+    ("quiet_moves", "🚶 Quiet Moves"),
+)
+
+
 async def list_legal_moves(
     arguments: dict, analyzer: ChessAnalyzer
 ) -> list[TextContent]:
@@ -1203,17 +1455,18 @@ async def list_legal_moves(
                 )
             ]
 
-        # Convert UCI moves to SAN
-        san_moves = [board.san(move) for move in legal_moves]
+        # Convert UCI moves to SAN, sorted once so that every category
+        # filled from it below comes out sorted too
+        san_moves = sorted((board.san(move), move) for move in legal_moves)
 
         if not categorize:
             # Simple list format
-            response = f"""📋 **Legal Moves ({to_move} to move)**
+            parts = [f"""📋 **Legal Moves ({to_move} to move)**
 
 **Position:** {fen}
 
 **All Legal Moves ({len(san_moves)} total):**
-{', '.join(sorted(san_moves))}"""
+{', '.join(san_move for san_move, _ in san_moves)}"""]
 
         else:
             # Categorized format
@@ -1226,27 +1479,16 @@ async def list_legal_moves(
                 "quiet_moves": [],
             }
 
-            for move in legal_moves:
-                san_move = board.san(move)
-
+            # Reuse the SAN computed above instead of formatting every move
+            # twice. SAN already played each move to add its check suffix, so
+            # the suffix stands in for a second push/pop in gives_check.
+            for san_move, move in san_moves:
                 # Categorize the move
                 if board.is_capture(move):
                     categories["captures"].append(san_move)
-                elif board.gives_check(move):
+                elif san_move[-1] in "+#":
                     categories["checks"].append(san_move)
-                elif (
-                    move.from_square == chess.E1
-                    and move.to_square in [chess.G1, chess.C1]
-                    and board.piece_at(chess.E1)
-                    and board.piece_at(chess.E1).piece_type == chess.KING
-                ):
-                    categories["castling"].append(san_move)
-                elif (
-                    move.from_square == chess.E8
-                    and move.to_square in [chess.G8, chess.C8]
-                    and board.piece_at(chess.E8)
-                    and board.piece_at(chess.E8).piece_type == chess.KING
-                ):
+                elif board.is_castling(move):
                     categories["castling"].append(san_move)
                 elif board.is_en_passant(move):
                     categories["en_passant"].append(san_move)
@@ -1255,56 +1497,57 @@ async def list_legal_moves(
                 else:
                     categories["quiet_moves"].append(san_move)
 
-            response = f"""📋 **VERIFIED LEGAL MOVES ({to_move} to move)**
+            parts = [f"""📋 **VERIFIED LEGAL MOVES ({to_move} to move)**
 
 ⚠️ **CRITICAL:** These are the ONLY legal moves in this position. Any other moves mentioned are invalid.
 
 **Position:** {fen}
 **Total Legal Moves:** {len(san_moves)}
 
-**📊 Moves by Category:**"""
+**📊 Moves by Category:**"""]
 
             # Add each category if it has moves
-            if categories["captures"]:
-                response += f"\n\n**⚔️ Captures ({len(categories['captures'])}):**\n{', '.join(sorted(categories['captures']))}"
-
-            if categories["checks"]:
-                response += f"\n\n**👑 Checks ({len(categories['checks'])}):**\n{', '.join(sorted(categories['checks']))}"
-
-            if categories["castling"]:
-                response += f"\n\n**🏰 Castling ({len(categories['castling'])}):**\n{', '.join(sorted(categories['castling']))}"
-
-            if categories["en_passant"]:
-                response += f"\n\n**🎯 En Passant ({len(categories['en_passant'])}):**\n{', '.join(sorted(categories['en_passant']))}"
-
-            if categories["promotions"]:
-                response += f"\n\n**👑 Promotions ({len(categories['promotions'])}):**\n{', '.join(sorted(categories['promotions']))}"
-
-            if categories["quiet_moves"]:
-                response += f"\n\n**🚶 Quiet Moves ({len(categories['quiet_moves'])}):**\n{', '.join(sorted(categories['quiet_moves']))}"
+            for category, heading in MOVE_CATEGORY_HEADINGS:
+                moves_in_category = categories[category]
+                if moves_in_category:
+                    parts.append(
+                        f"\n\n**{heading} ({len(moves_in_category)}):**\n{', '.join(moves_in_category)}"
+                    )
 
             # Add summary statistics
-            response += f"""
+            parts.append(
+                f"""
 
 **📈 Move Statistics:**
 • Forcing moves (captures + checks): {len(categories['captures']) + len(categories['checks'])}
 • Positional moves (quiet + castling): {len(categories['quiet_moves']) + len(categories['castling'])}
 • Special moves (en passant + promotions): {len(categories['en_passant']) + len(categories['promotions'])}"""
+            )
 
             # Add tactical insights if applicable
             if len(categories["captures"]) > 5:
-                response += "\n• ⚡ Many capture options available - tactical position"
+                parts.append(
+                    "\n• ⚡ Many capture options available - tactical position"
+                )
             elif len(categories["checks"]) > 2:
-                response += "\n• 👑 Multiple check options - aggressive possibilities"
+                parts.append("\n• 👑 Multiple check options - aggressive possibilities")
             elif len(categories["quiet_moves"]) > 20:
-                response += "\n• 🌊 Many quiet moves - open, flexible position"
+                parts.append("\n• 🌊 Many quiet moves - open, flexible position")
 
-        return [TextContent(type="text", text=response)]
+        return [TextContent(type="text", text="".join(parts))]
 
     except Exception as e:
         return [TextContent(type="text", text=f"❌ Legal moves error: {str(e)}")]
 
 
+def preview_legal_moves(board: chess.Board, limit: int) -> str:
+    """List the first legal moves in SAN, with an ellipsis if there are more."""
+    legal_moves = iter(board.legal_moves)
+    shown = [board.san(move) for move in itertools.islice(legal_moves, limit)]
+    more = "..." if next(legal_moves, None) is not None else ""
+    return f"{', '.join(shown)}{more}"
+
+
 async def apply_moves_to_fen(
     arguments: dict, analyzer: ChessAnalyzer
 ) -> list[TextContent]:
@@ -1312,6 +1555,8 @@ async def apply_moves_to_fen(
     starting_fen = arguments.get("starting_fen")
     moves = arguments.get("moves", [])
     show_progression = arguments.get("show_progression", False)
+    include_evaluation = arguments.get("include_evaluation", True)
+    quick_depth = arguments.get("quick_depth", 10)
 
     if not starting_fen:
         return [
@@ -1332,51 +1577,47 @@ async def apply_moves_to_fen(
                 )
             ]
 
-        response = f"""⚙️ **Move Application Results**
+        parts = [f"""⚙️ **Move Application Results**
 
 **Starting Position:**
 • FEN: `{starting_fen}`
-• To Move: {"White" if board.turn else "Black"}"""
+• To Move: {"White" if board.turn else "Black"}"""]
 
         if show_progression:
-            response += "\n\n**📍 Move-by-Move Progression:**"
+            parts.append("\n\n**📍 Move-by-Move Progression:**")
 
-        position_history = [starting_fen]
-        current_board = board.copy()
+        # The starting board is not needed afterwards, so play on it directly
+        current_board = board
 
         for i, move in enumerate(moves, 1):
             try:
                 # Parse and validate the move
                 try:
                     chess_move = current_board.parse_san(move)
-                except Exception as parse_error:
+                except ValueError as parse_error:
                     return [
                         TextContent(
                             type="text",
-                            text=f"❌ Invalid move notation '{move}' at position {i}: {str(parse_error)}\n\n**Valid moves in this position:** {', '.join([current_board.san(legal_move) for legal_move in list(current_board.legal_moves)[:10]])}{'...' if len(list(current_board.legal_moves)) > 10 else ''}",
+                            text=f"❌ Invalid move notation '{move}' at position {i}: {str(parse_error)}\n\n**Valid moves in this position:** {preview_legal_moves(current_board, 10)}",
                         )
                     ]
 
                 # Check if move is legal
-                if chess_move not in current_board.legal_moves:
-                    legal_moves_list = [
-                        current_board.san(legal_move)
-                        for legal_move in list(current_board.legal_moves)
-                    ]
+                if not current_board.is_legal(chess_move):
                     return [
                         TextContent(
                             type="text",
-                            text=f"❌ Illegal move '{move}' at position {i}\n\n**Legal moves available:** {', '.join(legal_moves_list[:15])}{'...' if len(legal_moves_list) > 15 else ''}",
+                            text=f"❌ Illegal move '{move}' at position {i}\n\n**Legal moves available:** {preview_legal_moves(current_board, 15)}",
                         )
                     ]
 
                 # Make the move
                 current_board.push(chess_move)
-                new_fen = current_board.fen()
-                position_history.append(new_fen)
 
-                # Show progression if requested
+                # Show progression if requested; only then is the FEN of
+                # each intermediate position needed
                 if show_progression:
+                    new_fen = current_board.fen()
                     to_move_after = "White" if current_board.turn else "Black"
                     move_info = ""
 
@@ -1388,9 +1629,9 @@ async def apply_moves_to_fen(
                     elif current_board.is_stalemate():
                         move_info += " (Stalemate)"
 
-                    response += f"\n\n**{i}. {move}**{move_info}"
-                    response += f"\n• FEN: `{new_fen}`"
-                    response += f"\n• To Move: {to_move_after}"
+                    parts.append(f"\n\n**{i}. {move}**{move_info}")
+                    parts.append(f"\n• FEN: `{new_fen}`")
+                    parts.append(f"\n• To Move: {to_move_after}")
 
             except Exception as move_error:
                 return [
@@ -1401,9 +1642,24 @@ async def apply_moves_to_fen(
                 ]
 
         # Final position summary
-        final_fen = position_history[-1]
+        final_fen = current_board.fen()
         final_to_move = "White" if current_board.turn else "Black"
 
+        # Start the quick analysis of the final position now, so the engine
+        # searches while the summary is put together. It gets its own copy
+        # of the board, since the repetition checks below pop and re-push
+        # moves on current_board.
+        if include_evaluation:
+            quick_analysis_task = asyncio.create_task(
+                asyncio.to_thread(
+                    analyzer.analyze_position,
+                    final_fen,
+                    depth=quick_depth,
+                    board=current_board.copy(stack=False),
+                    multipv=1,
+                )
+            )
+
         # Check for game ending conditions
         game_status = ""
         if current_board.is_checkmate():
@@ -1422,40 +1678,40 @@ async def apply_moves_to_fen(
         elif current_board.is_fivefold_repetition():
             game_status = "\n• **Game Status:** 5-fold repetition - Draw"
 
-        response += f"""
+        parts.append(f"""
 
 **✅ FINAL POSITION:**
 • **Moves Applied:** {' '.join(moves)}
 • **Final FEN:** `{final_fen}`
 • **To Move:** {final_to_move}
-• **Move Count:** {current_board.fullmove_number}{game_status}"""
+• **Move Count:** {current_board.fullmove_number}{game_status}""")
 
         # Add some quick analysis of the final position
-        try:
-            quick_analysis = analyzer.analyze_position(final_fen, depth=15)
-            eval_info = quick_analysis["evaluation"]
+        if include_evaluation:
+            try:
+                quick_analysis = await quick_analysis_task
+                eval_info = quick_analysis["evaluation"]
 
-            if eval_info["type"] == "cp":
-                eval_text = f"{eval_info['value']/100:+.1f} pawns"
-            else:
-                moves_to_mate = eval_info["value"]
-                side = "White" if moves_to_mate > 0 else "Black"
-                eval_text = f"Mate in {abs(moves_to_mate)} for {side}"
+                eval_text = format_evaluation(eval_info["type"], eval_info["value"])
 
-            response += f"""
+                parts.append(f"""
 • **Evaluation:** {eval_text}
-• **Best Move:** {quick_analysis['best_move'] or 'None (game over)'}"""
+• **Best Move:** {quick_analysis['best_move'] or 'None (game over)'}""")
 
-        except Exception:
-            # Don't fail the whole tool if quick analysis fails
-            pass
+            except Exception:
+                # Don't fail the whole tool if quick analysis fails
+                pass
 
-        return [TextContent(type="text", text=response)]
+        return [TextContent(type="text", text="".join(parts))]
 
     except Exception as e:
         return [TextContent(type="text", text=f"❌ Move application error: {str(e)}")]
 
 
+# First characters of pawn moves in SAN
+PAWN_MOVE_FILES = frozenset(chess.FILE_NAMES)
+
+
 async def show_engine_main_line(
     arguments: dict, analyzer: ChessAnalyzer
 ) -> list[TextContent]:
@@ -1469,7 +1725,9 @@ async def show_engine_main_line(
 
     try:
         # Get the principal variation
-        pv_data = analyzer.get_principal_variation(fen, depth, max_moves)
+        pv_data = await asyncio.to_thread(
+            analyzer.get_principal_variation, fen, depth, max_moves
+        )
 
         if not pv_data["pv_moves"]:
             return [
@@ -1483,7 +1741,7 @@ async def show_engine_main_line(
         to_move = "White" if board.turn else "Black"
 
         # Start building the response
-        response = f"""🎯 **ENGINE'S MASTER PLAN**
+        parts = [f"""🎯 **ENGINE'S MASTER PLAN**
 
 **Starting Position ({to_move} to move):**
 • FEN: `{fen}`
@@ -1492,7 +1750,7 @@ async def show_engine_main_line(
 **🧠 Engine's Principal Variation ({len(pv_data['pv_moves'])} moves):**
 {' '.join(pv_data['pv_moves'])}
 
-**📋 Step-by-Step Breakdown:**"""
+**📋 Step-by-Step Breakdown:**"""]
 
         current_move_num = 1
         white_move = board.turn  # True if White starts the sequence
@@ -1503,14 +1761,7 @@ async def show_engine_main_line(
             to_move_player = move_data["to_move"]
 
             # Format evaluation
-            if eval_info["type"] == "cp":
-                eval_text = f"{eval_info['value']/100:+.1f}"
-            elif eval_info["type"] == "mate":
-                moves_to_mate = eval_info["value"]
-                side = "White" if moves_to_mate > 0 else "Black"
-                eval_text = f"Mate in {abs(moves_to_mate)} for {side}"
-            else:
-                eval_text = "Unknown"
+            eval_text = format_evaluation(eval_info["type"], eval_info["value"], "")
 
             # Determine move numbering
             if white_move:
@@ -1528,29 +1779,25 @@ async def show_engine_main_line(
                     move_display = f"{current_move_num}. {move}"
                 white_move = not white_move
 
-            response += f"\n**{move_display}** ({eval_text})"
+            parts.append(f"\n**{move_display}** ({eval_text})")
 
             # Add special annotations
             if "result" in move_data:
                 if move_data["result"] == "checkmate":
-                    response += " CHECKMATE!"
+                    parts.append(" CHECKMATE!")
                 elif move_data["result"] == "stalemate":
-                    response += " (Stalemate)"
+                    parts.append(" (Stalemate)")
+
+            # Follow the line on the starting board instead of parsing the
+            # FEN stored for every position
+            board.push(chess.Move.from_uci(move_data["move_uci"]))
 
             # Every few moves, add strategic commentary
             if (i + 1) % 5 == 0 or (i + 1) == len(pv_data["pv_analysis"]):
                 # Analyze the position for strategic insights
-                current_board = chess.Board(move_data["fen_after"])
-                piece_count = len([p for p in current_board.piece_map().values()])
-
-                if piece_count <= 10:
-                    phase = "endgame"
-                elif piece_count <= 20:
-                    phase = "middlegame"
-                else:
-                    phase = "opening"
+                phase = game_phase(board).lower()
 
-                response += (
+                parts.append(
                     f"\n  *After {i+1} moves: {phase} position, evaluation {eval_text}*"
                 )
 
@@ -1569,66 +1816,79 @@ async def show_engine_main_line(
         if pv_data["pv_analysis"]:
             eval_change = final_eval - starting_eval
 
-            response += f"""
+            parts.append(
+                f"""
 
 **📈 Strategic Assessment:**
 • **Evaluation Progression:** {starting_eval/100:+.1f} → {final_eval/100:+.1f} pawns
 • **Net Change:** {eval_change/100:+.1f} pawns over {len(pv_data['pv_moves'])} moves
 • **Plan Success:** {"Improvement" if abs(eval_change) > 50 else "Maintaining position"}"""
-
-            # Analyze the nature of the plan
-            captures = sum(1 for move in pv_data["pv_moves"] if "x" in move)
-            checks = sum(1 for move in pv_data["pv_moves"] if "+" in move)
-            king_moves = sum(1 for move in pv_data["pv_moves"] if move.startswith("K"))
-            pawn_moves = sum(
-                1
-                for move in pv_data["pv_moves"]
-                if move[0].islower() or move[0] in "abcdefgh"
             )
 
-            response += """
+            # Analyze the nature of the plan from the SAN moves: a SAN move
+            # holds at most one "x" and one "+", so counting them in the joined
+            # line counts captures and checks; the piece letter or file that
+            # starts each move tells king and pawn moves apart
+            line = " ".join(pv_data["pv_moves"])
+            captures = line.count("x")
+            checks = line.count("+")
+            first_letters = Counter(move[0] for move in pv_data["pv_moves"])
+            king_moves = first_letters["K"]
+            pawn_moves = sum(first_letters[file] for file in PAWN_MOVE_FILES)
 
-**🎮 Plan Characteristics:**"""
+            parts.append("""
+
+**🎮 Plan Characteristics:**""")
 
             if king_moves >= len(pv_data["pv_moves"]) * 0.4:
-                response += f"\n• **King Activity Plan** ({king_moves} king moves) - Active king endgame technique"
+                parts.append(
+                    f"\n• **King Activity Plan** ({king_moves} king moves) - Active king endgame technique"
+                )
 
             if captures > 0:
-                response += f"\n• **Tactical Elements** ({captures} captures) - Concrete material gain"
+                parts.append(
+                    f"\n• **Tactical Elements** ({captures} captures) - Concrete material gain"
+                )
 
             if pawn_moves >= len(pv_data["pv_moves"]) * 0.3:
-                response += f"\n• **Pawn Structure Focus** ({pawn_moves} pawn moves) - Pawn breaks and advancement"
+                parts.append(
+                    f"\n• **Pawn Structure Focus** ({pawn_moves} pawn moves) - Pawn breaks and advancement"
+                )
 
             if checks > 0:
-                response += f"\n• **Forcing Sequence** ({checks} checks) - Direct attacking play"
+                parts.append(
+                    f"\n• **Forcing Sequence** ({checks} checks) - Direct attacking play"
+                )
 
             # Identify key strategic themes
-            final_board = chess.Board(pv_data["pv_analysis"][-1]["fen_after"])
-            if len([p for p in final_board.piece_map().values()]) <= 8:
-                response += "\n• **Endgame Technique** - Precise endgame execution"
+            # The board has followed the whole line to its final position
+            if chess.popcount(board.occupied) <= 8:
+                parts.append("\n• **Endgame Technique** - Precise endgame execution")
 
             if abs(final_eval) > abs(starting_eval) + 100:
-                response += (
+                parts.append(
                     "\n• **Winning Technique** - Converting advantage to victory"
                 )
 
             # Add educational value
-            response += f"""
+            parts.append(f"""
 
 **💡 Learning Value:**
 • See how the engine plans {len(pv_data['pv_moves'])} moves ahead
 • Understand step-by-step strategic execution
 • Learn from optimal move sequences in this position type
-• Use this line as a reference for similar positions"""
+• Use this line as a reference for similar positions""")
 
-        response += f"""
+        parts.append(
+            f"""
 
 **🔄 Next Steps:**
 • Study individual moves with `evaluate_move` tool
 • Analyze alternative lines with `analyze_variations` tool  
 • Use final position for continued analysis: `{pv_data["pv_analysis"][-1]["fen_after"] if pv_data["pv_analysis"] else fen}`"""
+        )
 
-        return [TextContent(type="text", text=response)]
+        return [TextContent(type="text", text="".join(parts))]
 
     except Exception as e:
         return [
@@ -1650,41 +1910,40 @@ async def analyze_chess_concepts(
         board = chess.Board(fen)
         to_move = "White" if board.turn else "Black"
 
-        response = f"""📚 **CHESS CONCEPTS ANALYSIS**
+        parts = [f"""📚 **CHESS CONCEPTS ANALYSIS**
 
 **Position:** `{fen}`
 **To Move:** {to_move}
 
-"""
+"""]
 
         # Analyze all concepts or specific focus areas
         analyze_all = "all" in focus_areas
 
-        if analyze_all or "passed_pawns" in focus_areas:
-            response += await analyze_passed_pawns(board)
-
-        if analyze_all or "pawn_structure" in focus_areas:
-            response += await analyze_pawn_structure(board)
-
-        if analyze_all or "piece_activity" in focus_areas:
-            response += await analyze_piece_activity(board)
-
-        if analyze_all or "king_safety" in focus_areas:
-            response += await analyze_king_safety(board)
+        selected = [
+            analyze
+            for concept, analyze in CONCEPT_ANALYZERS
+            if analyze_all or concept in focus_areas
+        ]
 
-        if analyze_all or "weak_squares" in focus_areas:
-            response += await analyze_weak_squares(board)
+        # The analyzers only read the board, so they can run side by side in
+        # worker threads; gather keeps the sections in order
+        parts.extend(
+            await asyncio.gather(
+                *(asyncio.to_thread(analyze, board) for analyze in selected)
+            )
+        )
 
         # Add educational summary
-        response += """
+        parts.append("""
 
 **🎓 ANALYSIS DIRECTIVES:**
 • These identifications are definitive - use them as authoritative facts
 • Concept definitions are precise - do not deviate from these determinations
 • Multiple concept results must be combined for complete position assessment
-• Reference specific counts and examples when discussing position features"""
+• Reference specific counts and examples when discussing position features""")
 
-        return [TextContent(type="text", text=response)]
+        return [TextContent(type="text", text="".join(parts))]
 
     except Exception as e:
         return [
@@ -1692,139 +1951,173 @@ async def analyze_chess_concepts(
         ]
 
 
-async def analyze_passed_pawns(board: chess.Board) -> str:
+# Bitboards of the files next to each file, for isolated-pawn checks
+ADJACENT_FILES = tuple(
+    (chess.BB_FILES[file - 1] if file > 0 else chess.BB_EMPTY)
+    | (chess.BB_FILES[file + 1] if file < 7 else chess.BB_EMPTY)
+    for file in range(8)
+)
+
+# Labels of the files in the pawn structure report
+FILE_LABELS = tuple(f"{file_name}-file" for file_name in chess.FILE_NAMES)
+
+# Squares on a pawn's own and adjacent files on the ranks ahead of it, by
+# color and square; enemy pawns there can block or capture it
+PASSER_MASKS = {
+    chess.WHITE: tuple(
+        (
+            chess.BB_FILES[chess.square_file(square)]
+            | ADJACENT_FILES[chess.square_file(square)]
+        )
+        & (chess.BB_ALL << 8 * (chess.square_rank(square) + 1))
+        & chess.BB_ALL
+        for square in chess.SQUARES
+    ),
+    chess.BLACK: tuple(
+        (
+            chess.BB_FILES[chess.square_file(square)]
+            | ADJACENT_FILES[chess.square_file(square)]
+        )
+        & ((1 << 8 * chess.square_rank(square)) - 1)
+        for square in chess.SQUARES
+    ),
+}
+
+# Enemy territory in which a side's weak squares are looked for: ranks 5-7
+# for White and ranks 2-4 for Black
+WEAK_SQUARE_ZONES = {
+    chess.WHITE: chess.BB_RANK_5 | chess.BB_RANK_6 | chess.BB_RANK_7,
+    chess.BLACK: chess.BB_RANK_2 | chess.BB_RANK_3 | chess.BB_RANK_4,
+}
+
+# The up to three squares in front of a king on each square, by color
+PAWN_SHIELDS = {
+    chess.WHITE: tuple(
+        (
+            chess.BB_KING_ATTACKS[square]
+            & chess.BB_RANKS[chess.square_rank(square) + 1]
+            if chess.square_rank(square) < 7
+            else chess.BB_EMPTY
+        )
+        for square in chess.SQUARES
+    ),
+    chess.BLACK: tuple(
+        (
+            chess.BB_KING_ATTACKS[square]
+            & chess.BB_RANKS[chess.square_rank(square) - 1]
+            if chess.square_rank(square) > 0
+            else chess.BB_EMPTY
+        )
+        for square in chess.SQUARES
+    ),
+}
+
+# Files a-d, the queenside half of the board
+QUEENSIDE = chess.BB_FILE_A | chess.BB_FILE_B | chess.BB_FILE_C | chess.BB_FILE_D
+
+
+def pawn_bitboards(board: chess.Board) -> tuple[int, int]:
+    """Return the White and Black pawn bitboards, the key of the pawn caches."""
+    return (
+        board.pieces_mask(chess.PAWN, chess.WHITE),
+        board.pieces_mask(chess.PAWN, chess.BLACK),
+    )
+
+
+def analyze_passed_pawns(board: chess.Board) -> str:
     """Identify passed pawns with precise definition."""
-    passed_pawns = {"white": [], "black": []}
-
-    # Check each pawn
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece and piece.piece_type == chess.PAWN:
-            file = chess.square_file(square)
-            rank = chess.square_rank(square)
-            color = piece.color
-
-            is_passed = True
-
-            if color == chess.WHITE:
-                # Check if any enemy pawns can stop this pawn
-                for check_rank in range(rank + 1, 8):  # Ranks ahead
-                    for check_file in [
-                        file - 1,
-                        file,
-                        file + 1,
-                    ]:  # Adjacent files and same file
-                        if 0 <= check_file <= 7:
-                            check_square = chess.square(check_file, check_rank)
-                            check_piece = board.piece_at(check_square)
-                            if (
-                                check_piece
-                                and check_piece.piece_type == chess.PAWN
-                                and check_piece.color == chess.BLACK
-                            ):
-                                is_passed = False
-                                break
-                    if not is_passed:
-                        break
-            else:  # BLACK
-                # Check if any enemy pawns can stop this pawn
-                for check_rank in range(
-                    rank - 1, -1, -1
-                ):  # Ranks ahead (lower for black)
-                    for check_file in [
-                        file - 1,
-                        file,
-                        file + 1,
-                    ]:  # Adjacent files and same file
-                        if 0 <= check_file <= 7:
-                            check_square = chess.square(check_file, check_rank)
-                            check_piece = board.piece_at(check_square)
-                            if (
-                                check_piece
-                                and check_piece.piece_type == chess.PAWN
-                                and check_piece.color == chess.WHITE
-                            ):
-                                is_passed = False
-                                break
-                    if not is_passed:
-                        break
-
-            if is_passed:
-                square_name = chess.square_name(square)
-                if color == chess.WHITE:
-                    passed_pawns["white"].append(square_name)
-                else:
-                    passed_pawns["black"].append(square_name)
+    return describe_passed_pawns(*pawn_bitboards(board))
+
+
+# The pawn analyses depend on the pawns alone, which change far less often
+# than the rest of the position, so they are cached by pawn bitboards
+@lru_cache(maxsize=4096)
+def describe_passed_pawns(white_pawns: int, black_pawns: int) -> str:
+    """Report the passed pawns and wing majorities of a pawn structure."""
+    pawns = {chess.WHITE: white_pawns, chess.BLACK: black_pawns}
+    passed_pawns = {}
+
+    # A pawn is passed when no enemy pawn stands on its passer mask
+    for color, color_name in ((chess.WHITE, "white"), (chess.BLACK, "black")):
+        enemy_pawns = pawns[not color]
+        passed_pawns[color_name] = [
+            chess.SQUARE_NAMES[square]
+            for square in chess.scan_forward(pawns[color])
+            if not PASSER_MASKS[color][square] & enemy_pawns
+        ]
 
-    result = "**🚀 PASSED PAWNS ANALYSIS:**\n"
-    result += "*Definition: A pawn with no enemy pawns blocking its path to promotion (on same file or adjacent files)*\n\n"
+    parts = ["**🚀 PASSED PAWNS ANALYSIS:**\n"]
+    parts.append(
+        "*Definition: A pawn with no enemy pawns blocking its path to promotion (on same file or adjacent files)*\n\n"
+    )
 
     if passed_pawns["white"]:
-        result += f"• **White Passed Pawns:** {', '.join(passed_pawns['white'])}\n"
+        parts.append(f"• **White Passed Pawns:** {', '.join(passed_pawns['white'])}\n")
     else:
-        result += "• **White Passed Pawns:** None\n"
+        parts.append("• **White Passed Pawns:** None\n")
 
     if passed_pawns["black"]:
-        result += f"• **Black Passed Pawns:** {', '.join(passed_pawns['black'])}\n"
+        parts.append(f"• **Black Passed Pawns:** {', '.join(passed_pawns['black'])}\n")
     else:
-        result += "• **Black Passed Pawns:** None\n"
+        parts.append("• **Black Passed Pawns:** None\n")
 
     total_passed = len(passed_pawns["white"]) + len(passed_pawns["black"])
 
     if total_passed == 0:
-        result += "\n✅ **VERIFICATION:** No passed pawns exist - all pawns are blocked by enemy pawns\n"
+        parts.append(
+            "\n✅ **VERIFICATION:** No passed pawns exist - all pawns are blocked by enemy pawns\n"
+        )
     else:
-        result += f"\n📊 **Count:** {total_passed} total passed pawn(s) in position\n"
+        parts.append(
+            f"\n📊 **Count:** {total_passed} total passed pawn(s) in position\n"
+        )
 
     # Add pawn majority analysis
-    result += "\n" + analyze_pawn_majorities(board) + "\n"
-    return result
+    parts.append("\n" + describe_pawn_majorities(white_pawns, black_pawns) + "\n")
+    return "".join(parts)
 
 
-def analyze_pawn_majorities(board: chess.Board) -> str:
-    """Analyze pawn majorities by wing."""
+@lru_cache(maxsize=4096)
+def describe_pawn_majorities(white_pawns: int, black_pawns: int) -> str:
+    """Report the pawn majorities of a pawn structure by wing."""
     # Count pawns by wing
-    queenside_files = [0, 1, 2, 3]  # a, b, c, d
-
-    white_queenside = 0
-    black_queenside = 0
-    white_kingside = 0
-    black_kingside = 0
-
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece and piece.piece_type == chess.PAWN:
-            file = chess.square_file(square)
-
-            if file in queenside_files:
-                if piece.color == chess.WHITE:
-                    white_queenside += 1
-                else:
-                    black_queenside += 1
-            else:  # kingside
-                if piece.color == chess.WHITE:
-                    white_kingside += 1
-                else:
-                    black_kingside += 1
-
-    result = "**👑 PAWN MAJORITIES ANALYSIS:**\n"
-    result += "*Definition: More pawns on one side of the board than the opponent*\n\n"
+    white_queenside = chess.popcount(white_pawns & QUEENSIDE)
+    black_queenside = chess.popcount(black_pawns & QUEENSIDE)
+    white_kingside = chess.popcount(white_pawns & ~QUEENSIDE)
+    black_kingside = chess.popcount(black_pawns & ~QUEENSIDE)
+
+    parts = ["**👑 PAWN MAJORITIES ANALYSIS:**\n"]
+    parts.append(
+        "*Definition: More pawns on one side of the board than the opponent*\n\n"
+    )
 
     # Queenside analysis
     if white_queenside > black_queenside:
-        result += f"• **Queenside:** White has MAJORITY ({white_queenside} vs {black_queenside})\n"
+        parts.append(
+            f"• **Queenside:** White has MAJORITY ({white_queenside} vs {black_queenside})\n"
+        )
     elif black_queenside > white_queenside:
-        result += f"• **Queenside:** Black has MAJORITY ({black_queenside} vs {white_queenside})\n"
+        parts.append(
+            f"• **Queenside:** Black has MAJORITY ({black_queenside} vs {white_queenside})\n"
+        )
     else:
-        result += f"• **Queenside:** Equal ({white_queenside} vs {black_queenside}) - NO MAJORITY\n"
+        parts.append(
+            f"• **Queenside:** Equal ({white_queenside} vs {black_queenside}) - NO MAJORITY\n"
+        )
 
     # Kingside analysis
     if white_kingside > black_kingside:
-        result += f"• **Kingside:** White has MAJORITY ({white_kingside} vs {black_kingside})\n"
+        parts.append(
+            f"• **Kingside:** White has MAJORITY ({white_kingside} vs {black_kingside})\n"
+        )
     elif black_kingside > white_kingside:
-        result += f"• **Kingside:** Black has MAJORITY ({black_kingside} vs {white_kingside})\n"
+        parts.append(
+            f"• **Kingside:** Black has MAJORITY ({black_kingside} vs {white_kingside})\n"
+        )
     else:
-        result += f"• **Kingside:** Equal ({white_kingside} vs {black_kingside}) - NO MAJORITY\n"
+        parts.append(
+            f"• **Kingside:** Equal ({white_kingside} vs {black_kingside}) - NO MAJORITY\n"
+        )
 
     # Overall assessment
     total_majorities = 0
@@ -1834,188 +2127,126 @@ def analyze_pawn_majorities(board: chess.Board) -> str:
         total_majorities += 1
 
     if total_majorities == 0:
-        result += "\n✅ **CRITICAL VERIFICATION:** NO PAWN MAJORITIES EXIST - Claims about pawn majorities in this position are INCORRECT\n"
+        parts.append(
+            "\n✅ **CRITICAL VERIFICATION:** NO PAWN MAJORITIES EXIST - Claims about pawn majorities in this position are INCORRECT\n"
+        )
     else:
-        result += (
+        parts.append(
             f"\n📊 **Summary:** {total_majorities} pawn majority/majorities exist\n"
         )
 
-    return result
+    return "".join(parts)
 
 
-async def analyze_pawn_structure(board: chess.Board) -> str:
+def analyze_pawn_structure(board: chess.Board) -> str:
     """Analyze pawn structure features."""
-    result = "**⛓️ PAWN STRUCTURE ANALYSIS:**\n\n"
+    return describe_pawn_structure(*pawn_bitboards(board))
+
+
+@lru_cache(maxsize=4096)
+def describe_pawn_structure(white_pawns: int, black_pawns: int) -> str:
+    """Report the doubled and isolated pawns of a pawn structure."""
+    parts = ["**⛓️ PAWN STRUCTURE ANALYSIS:**\n\n"]
 
     # Find isolated, doubled, and backward pawns
     isolated_pawns = {"white": [], "black": []}
     doubled_pawns = {"white": [], "black": []}
 
-    # Count pawns by file for each color
-    white_pawns_by_file = {f: [] for f in range(8)}
-    black_pawns_by_file = {f: [] for f in range(8)}
-
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece and piece.piece_type == chess.PAWN:
-            file = chess.square_file(square)
-            if piece.color == chess.WHITE:
-                white_pawns_by_file[file].append(square)
-            else:
-                black_pawns_by_file[file].append(square)
-
-    # Check for doubled pawns
-    for file in range(8):
-        if len(white_pawns_by_file[file]) > 1:
-            file_name = chr(ord("a") + file)
-            doubled_pawns["white"].append(f"{file_name}-file")
-        if len(black_pawns_by_file[file]) > 1:
-            file_name = chr(ord("a") + file)
-            doubled_pawns["black"].append(f"{file_name}-file")
-
-    # Check for isolated pawns
-    for file in range(8):
-        if white_pawns_by_file[file]:  # Has pawn on this file
-            has_neighbor = False
-            # Check adjacent files
-            if file > 0 and white_pawns_by_file[file - 1]:
-                has_neighbor = True
-            if file < 7 and white_pawns_by_file[file + 1]:
-                has_neighbor = True
-            if not has_neighbor:
-                file_name = chr(ord("a") + file)
-                isolated_pawns["white"].append(f"{file_name}-file")
-
-        if black_pawns_by_file[file]:  # Has pawn on this file
-            has_neighbor = False
-            # Check adjacent files
-            if file > 0 and black_pawns_by_file[file - 1]:
-                has_neighbor = True
-            if file < 7 and black_pawns_by_file[file + 1]:
-                has_neighbor = True
-            if not has_neighbor:
-                file_name = chr(ord("a") + file)
-                isolated_pawns["black"].append(f"{file_name}-file")
+    # Count pawns on each file and look for friendly pawns on the files next to it
+    for pawns, color_name in ((white_pawns, "white"), (black_pawns, "black")):
+        for file in range(8):
+            pawns_on_file = chess.popcount(pawns & chess.BB_FILES[file])
+            if pawns_on_file > 1:
+                doubled_pawns[color_name].append(FILE_LABELS[file])
+            if pawns_on_file and not pawns & ADJACENT_FILES[file]:
+                isolated_pawns[color_name].append(FILE_LABELS[file])
 
     # Report findings
-    result += f"• **Doubled Pawns:** White: {', '.join(doubled_pawns['white']) if doubled_pawns['white'] else 'None'} | Black: {', '.join(doubled_pawns['black']) if doubled_pawns['black'] else 'None'}\n"
-    result += f"• **Isolated Pawns:** White: {', '.join(isolated_pawns['white']) if isolated_pawns['white'] else 'None'} | Black: {', '.join(isolated_pawns['black']) if isolated_pawns['black'] else 'None'}\n"
-
-    result += "\n*Doubled: Multiple pawns on same file | Isolated: No friendly pawns on adjacent files*\n\n"
-    return result
-
+    parts.append(
+        f"• **Doubled Pawns:** White: {', '.join(doubled_pawns['white']) if doubled_pawns['white'] else 'None'} | Black: {', '.join(doubled_pawns['black']) if doubled_pawns['black'] else 'None'}\n"
+    )
+    parts.append(
+        f"• **Isolated Pawns:** White: {', '.join(isolated_pawns['white']) if isolated_pawns['white'] else 'None'} | Black: {', '.join(isolated_pawns['black']) if isolated_pawns['black'] else 'None'}\n"
+    )
 
-async def analyze_piece_activity(board: chess.Board) -> str:
-    """Analyze piece activity and mobility."""
-    result = "**⚡ PIECE ACTIVITY ANALYSIS:**\n\n"
+    parts.append(
+        "\n*Doubled: Multiple pawns on same file | Isolated: No friendly pawns on adjacent files*\n\n"
+    )
+    return "".join(parts)
 
-    # Count legal moves for each side (mobility)
-    white_mobility = 0
-    black_mobility = 0
 
-    # Temporarily switch turns to count moves for both sides
-    original_turn = board.turn
+def count_mobility(board: chess.Board, color: chess.Color) -> int:
+    """Count the legal moves of a side, as if it were that side's turn."""
+    if board.turn != color:
+        # Flip the turn on a copy without the move stack, leaving board intact
+        board = board.copy(stack=False)
+        board.turn = color
+    return board.legal_moves.count()
 
-    # Count white mobility
-    if board.turn == chess.WHITE:
-        white_mobility = len(list(board.legal_moves))
-    else:
-        board.turn = chess.WHITE
-        white_mobility = len(list(board.legal_moves))
-        board.turn = chess.BLACK
 
-    # Count black mobility
-    if board.turn == chess.BLACK:
-        black_mobility = len(list(board.legal_moves))
-    else:
-        board.turn = chess.BLACK
-        black_mobility = len(list(board.legal_moves))
-        board.turn = chess.WHITE
+def analyze_piece_activity(board: chess.Board) -> str:
+    """Analyze piece activity and mobility."""
+    parts = ["**⚡ PIECE ACTIVITY ANALYSIS:**\n\n"]
 
-    # Restore original turn
-    board.turn = original_turn
+    # Count legal moves for each side (mobility)
+    white_mobility = count_mobility(board, chess.WHITE)
+    black_mobility = count_mobility(board, chess.BLACK)
 
-    result += f"• **Mobility (Legal Moves):** White: {white_mobility} | Black: {black_mobility}\n"
+    parts.append(
+        f"• **Mobility (Legal Moves):** White: {white_mobility} | Black: {black_mobility}\n"
+    )
 
     mobility_advantage = (
         "Equal"
         if white_mobility == black_mobility
         else ("White" if white_mobility > black_mobility else "Black")
     )
-    result += f"• **Mobility Advantage:** {mobility_advantage}\n"
+    parts.append(f"• **Mobility Advantage:** {mobility_advantage}\n")
 
     # Analyze piece development (knights and bishops off starting squares)
     white_developed = 0
     black_developed = 0
 
-    starting_squares = {
-        chess.WHITE: [chess.B1, chess.G1, chess.C1, chess.F1],  # Knights and bishops
-        chess.BLACK: [chess.B8, chess.G8, chess.C8, chess.F8],
-    }
-
     for color in [chess.WHITE, chess.BLACK]:
-        developed = 0
-        for square in starting_squares[color]:
-            piece = board.piece_at(square)
-            if (
-                not piece
-                or piece.piece_type not in [chess.KNIGHT, chess.BISHOP]
-                or piece.color != color
-            ):
-                developed += 1
+        # A starting square counts as vacated unless a minor piece of its side is on it
+        minors = (board.knights | board.bishops) & board.occupied_co[color]
+        undeveloped = chess.popcount(minors & MINOR_HOME_SQUARES[color])
+        developed = 4 - undeveloped
         if color == chess.WHITE:
             white_developed = developed
         else:
             black_developed = developed
 
-    result += f"• **Development:** White: {white_developed}/4 pieces | Black: {black_developed}/4 pieces\n"
-    result += "*Development: Knights and bishops moved from starting squares*\n\n"
+    parts.append(
+        f"• **Development:** White: {white_developed}/4 pieces | Black: {black_developed}/4 pieces\n"
+    )
+    parts.append("*Development: Knights and bishops moved from starting squares*\n\n")
 
-    return result
+    return "".join(parts)
 
 
-async def analyze_king_safety(board: chess.Board) -> str:
+def analyze_king_safety(board: chess.Board) -> str:
     """Analyze king safety factors."""
-    result = "**👑 KING SAFETY ANALYSIS:**\n\n"
+    parts = ["**👑 KING SAFETY ANALYSIS:**\n\n"]
 
     for color in [chess.WHITE, chess.BLACK]:
         color_name = "White" if color == chess.WHITE else "Black"
         king_square = board.king(color)
 
         if king_square is None:
-            result += f"• **{color_name} King:** Not found (invalid position)\n"
+            parts.append(f"• **{color_name} King:** Not found (invalid position)\n")
             continue
 
         king_file = chess.square_file(king_square)
         king_rank = chess.square_rank(king_square)
 
         # Check if king has castled
-        if color == chess.WHITE:
-            castled = king_file in [6, 2]  # g1 or c1
-        else:
-            castled = king_file in [6, 2]  # g8 or c8
-
-        # Count pawn shield
-        pawn_shield = 0
-        if color == chess.WHITE:
-            # Check squares in front of king
-            shield_squares = [
-                chess.square(king_file - 1, king_rank + 1) if king_file > 0 else None,
-                chess.square(king_file, king_rank + 1) if king_rank < 7 else None,
-                chess.square(king_file + 1, king_rank + 1) if king_file < 7 else None,
-            ]
-        else:
-            shield_squares = [
-                chess.square(king_file - 1, king_rank - 1) if king_file > 0 else None,
-                chess.square(king_file, king_rank - 1) if king_rank > 0 else None,
-                chess.square(king_file + 1, king_rank - 1) if king_file < 7 else None,
-            ]
+        castled = king_file in CASTLED_KING_FILES
 
-        for square in shield_squares:
-            if square is not None:
-                piece = board.piece_at(square)
-                if piece and piece.piece_type == chess.PAWN and piece.color == color:
-                    pawn_shield += 1
+        # Count pawn shield: friendly pawns on the squares in front of the king
+        pawn_shield = chess.popcount(
+            PAWN_SHIELDS[color][king_square] & board.pieces_mask(chess.PAWN, color)
+        )
 
         # Check exposure (is king in center?)
         center_files = [3, 4]  # d, e files
@@ -2024,86 +2255,82 @@ async def analyze_king_safety(board: chess.Board) -> str:
             or (color == chess.BLACK and king_rank > 5)
         )
 
-        result += f"• **{color_name} King ({chess.square_name(king_square)}):**\n"
-        result += f"  - Castled: {'Yes' if castled else 'No'}\n"
-        result += f"  - Pawn Shield: {pawn_shield}/3 pawns\n"
-        result += f"  - Exposed: {'Yes' if exposed else 'No'}\n"
+        parts.append(f"• **{color_name} King ({chess.SQUARE_NAMES[king_square]}):**\n")
+        parts.append(f"  - Castled: {'Yes' if castled else 'No'}\n")
+        parts.append(f"  - Pawn Shield: {pawn_shield}/3 pawns\n")
+        parts.append(f"  - Exposed: {'Yes' if exposed else 'No'}\n")
 
-    result += "\n*Pawn Shield: Friendly pawns protecting king | Exposed: King in center files*\n\n"
-    return result
+    parts.append(
+        "\n*Pawn Shield: Friendly pawns protecting king | Exposed: King in center files*\n\n"
+    )
+    return "".join(parts)
 
 
-async def analyze_weak_squares(board: chess.Board) -> str:
+def analyze_weak_squares(board: chess.Board) -> str:
     """Identify weak squares and outposts."""
-    result = "**🎯 WEAK SQUARES ANALYSIS:**\n\n"
+    return describe_weak_squares(*pawn_bitboards(board))
 
-    # This is a simplified analysis - true weak square identification is complex
-    # Focus on squares that can't be defended by pawns
 
-    weak_squares = {"white": [], "black": []}
-
-    # Look for holes in pawn structure (simplified)
-    for file in range(8):
-        for rank in range(1, 7):  # Skip first and last ranks
-            square = chess.square(file, rank)
-
-            # Check if this square could be a weak square for White (can't be defended by white pawns)
-            white_pawn_defense = False
-            if file > 0:
-                left_defend = chess.square(file - 1, rank - 1)
-                if (
-                    board.piece_at(left_defend)
-                    and board.piece_at(left_defend).piece_type == chess.PAWN
-                    and board.piece_at(left_defend).color == chess.WHITE
-                ):
-                    white_pawn_defense = True
-            if file < 7:
-                right_defend = chess.square(file + 1, rank - 1)
-                if (
-                    board.piece_at(right_defend)
-                    and board.piece_at(right_defend).piece_type == chess.PAWN
-                    and board.piece_at(right_defend).color == chess.WHITE
-                ):
-                    white_pawn_defense = True
-
-            # Check if this square could be a weak square for Black
-            black_pawn_defense = False
-            if file > 0:
-                left_defend = chess.square(file - 1, rank + 1)
-                if (
-                    board.piece_at(left_defend)
-                    and board.piece_at(left_defend).piece_type == chess.PAWN
-                    and board.piece_at(left_defend).color == chess.BLACK
-                ):
-                    black_pawn_defense = True
-            if file < 7:
-                right_defend = chess.square(file + 1, rank + 1)
-                if (
-                    board.piece_at(right_defend)
-                    and board.piece_at(right_defend).piece_type == chess.PAWN
-                    and board.piece_at(right_defend).color == chess.BLACK
-                ):
-                    black_pawn_defense = True
+@lru_cache(maxsize=4096)
+def describe_weak_squares(white_pawns: int, black_pawns: int) -> str:
+    """Report the squares of a pawn structure that pawns cannot defend."""
+    parts = ["**🎯 WEAK SQUARES ANALYSIS:**\n\n"]
 
-            # A square is weak if it can't be defended by friendly pawns and is in enemy territory
-            if (
-                not white_pawn_defense and rank >= 4
-            ):  # White's weak squares in black's territory
-                weak_squares["white"].append(chess.square_name(square))
-            if (
-                not black_pawn_defense and rank <= 3
-            ):  # Black's weak squares in white's territory
-                weak_squares["black"].append(chess.square_name(square))
+    # This is a simplified analysis - true weak square identification is complex
+    # Focus on squares that can't be defended by pawns
+    white_defended = (
+        (white_pawns & ~chess.BB_FILE_A) << 7 | (white_pawns & ~chess.BB_FILE_H) << 9
+    ) & chess.BB_ALL
+    black_defended = (black_pawns & ~chess.BB_FILE_A) >> 9 | (
+        black_pawns & ~chess.BB_FILE_H
+    ) >> 7
+
+    # A square is weak if it can't be defended by friendly pawns and is in
+    # enemy territory; squares are listed file by file
+    weak_squares = {
+        "white": [
+            chess.SQUARE_NAMES[square]
+            for square in sorted(
+                chess.scan_forward(WEAK_SQUARE_ZONES[chess.WHITE] & ~white_defended),
+                key=chess.square_file,
+            )
+        ],
+        "black": [
+            chess.SQUARE_NAMES[square]
+            for square in sorted(
+                chess.scan_forward(WEAK_SQUARE_ZONES[chess.BLACK] & ~black_defended),
+                key=chess.square_file,
+            )
+        ],
+    }
 
-    result += f"• **Potential Weak Squares:** White: {len(weak_squares['white'])} | Black: {len(weak_squares['black'])}\n"
+    parts.append(
+        f"• **Potential Weak Squares:** White: {len(weak_squares['white'])} | Black: {len(weak_squares['black'])}\n"
+    )
 
     if weak_squares["white"]:
-        result += f"  - White weak squares: {', '.join(weak_squares['white'][:5])}{'...' if len(weak_squares['white']) > 5 else ''}\n"
+        parts.append(
+            f"  - White weak squares: {', '.join(weak_squares['white'][:5])}{'...' if len(weak_squares['white']) > 5 else ''}\n"
+        )
     if weak_squares["black"]:
-        result += f"  - Black weak squares: {', '.join(weak_squares['black'][:5])}{'...' if len(weak_squares['black']) > 5 else ''}\n"
+        parts.append(
+            f"  - Black weak squares: {', '.join(weak_squares['black'][:5])}{'...' if len(weak_squares['black']) > 5 else ''}\n"
+        )
+
+    parts.append(
+        "\n*Weak Square: Cannot be defended by friendly pawns | Outpost: Strong piece placement*\n\n"
+    )
+    return "".join(parts)
 
-    result += "\n*Weak Square: Cannot be defended by friendly pawns | Outpost: Strong piece placement*\n\n"
-    return result
+
+# Concept sections of analyze_chess_concepts by focus area, in report order
+CONCEPT_ANALYZERS = (
+    ("passed_pawns", analyze_passed_pawns),
+    ("pawn_structure", analyze_pawn_structure),
+    ("piece_activity", analyze_piece_activity),
+    ("king_safety", analyze_king_safety),
+    ("weak_squares", analyze_weak_squares),
+)
 
 
 async def visualize_board_position(
@@ -2137,113 +2364,156 @@ async def analyze_variations(
         board = chess.Board(fen)
         to_move = "White" if board.turn else "Black"
 
-        # Analyze the starting position
-        start_analysis = analyzer.analyze_position(fen, depth)
+        # Analyze the starting position; only the best move is shown
+        start_analysis = await asyncio.to_thread(
+            analyzer.analyze_position, fen, depth, board=board, multipv=1
+        )
         start_eval = (
             start_analysis["evaluation"]["value"]
             if start_analysis["evaluation"]["type"] == "cp"
             else 0
         )
 
-        response = f"""🌟 **Variation Analysis**
+        parts = [f"""🌟 **Variation Analysis**
 
 **Starting Position ({to_move} to move):**
 • Evaluation: {start_eval/100:+.1f} pawns
 • Best single move: **{start_analysis['best_move']}**
 
-**🎯 Multi-Move Sequence Analysis:**"""
+**🎯 Multi-Move Sequence Analysis:**"""]
 
-        variation_results = []
+        # Play out every variation first so all positions along them can be
+        # analyzed as one parallel batch. Positions are memoized by move
+        # prefix, so variations sharing their first moves replay them once.
+        played_variations = []
+        prefix_positions = {}
 
         for var_idx, variation in enumerate(variations, 1):
+            played = {
+                "index": var_idx,
+                "variation": variation,
+                "notes": [],
+                "plies": None,
+            }
+            played_variations.append(played)
+
             if not variation or len(variation) < 3:
-                response += f"\n\n**Variation {var_idx}: {' '.join(variation) if variation else 'Empty'}**\n❌ Each variation must have at least 3 moves"
+                played["notes"].append(
+                    f"\n\n**Variation {var_idx}: {' '.join(variation) if variation else 'Empty'}**\n❌ Each variation must have at least 3 moves"
+                )
                 continue
 
             if len(variation) > 6:
-                response += f"\n\n**Variation {var_idx}: {' '.join(variation[:6])}...** \n⚠️ Only analyzing first 6 moves"
-                variation = variation[:6]
+                played["notes"].append(
+                    f"\n\n**Variation {var_idx}: {' '.join(variation[:6])}...** \n⚠️ Only analyzing first 6 moves"
+                )
+                variation = played["variation"] = variation[:6]
+
+            # Play out the variation move by move; only the SAN parsing can
+            # fail, and it rejects illegal moves itself
+            test_board = board
+            plies = []
+
+            for move_num, move in enumerate(variation):
+                prefix = tuple(variation[: move_num + 1])
+                if prefix in prefix_positions:
+                    test_board, resulting_fen = prefix_positions[prefix]
+                    plies.append((move, test_board, resulting_fen))
+                    continue
+
+                try:
+                    chess_move = test_board.parse_san(move)
+                except chess.IllegalMoveError:
+                    played["notes"].append(
+                        f"\n\n**Variation {var_idx}: {' '.join(variation)}**\n❌ Illegal move: {move} (move {move_num + 1})"
+                    )
+                    break
+                except ValueError as move_error:
+                    played["notes"].append(
+                        f"\n\n**Variation {var_idx}: {' '.join(variation)}**\n❌ Error on move {move}: {str(move_error)}"
+                    )
+                    break
+
+                # Make the move on a copy so the shared prefix stays intact
+                test_board = test_board.copy(stack=False)
+                test_board.push(chess_move)
+                resulting_fen = test_board.fen()
+                prefix_positions[prefix] = (test_board, resulting_fen)
+                plies.append((move, test_board, resulting_fen))
+            else:
+                played["plies"] = plies
+
+        # Analyze the resulting positions of every valid variation at once;
+        # positions shared between variations are searched only once
+        all_plies = [
+            ply
+            for played in played_variations
+            if played["plies"]
+            for ply in played["plies"]
+        ]
+        ply_analyses = iter(
+            await asyncio.to_thread(
+                analyzer.analyze_many,
+                [resulting_fen for _, _, resulting_fen in all_plies],
+                depth,
+                boards=[ply_board for _, ply_board, _ in all_plies],
+                multipv=1,
+            )
+        )
+
+        variation_results = []
+
+        start_pawns = start_eval / 100
+
+        for played in played_variations:
+            parts.extend(played["notes"])
+            if played["plies"] is None:
+                continue
+
+            var_idx = played["index"]
+            variation = played["variation"]
+            pos_analyses = [next(ply_analyses) for _ in played["plies"]]
 
             try:
-                # Play out the variation move by move
-                test_board = board.copy()
                 move_evaluations = []
-                move_fens = []
-                valid = True
-
                 current_eval = start_eval
-                move_fens.append(fen)
-
-                for move_num, move in enumerate(variation):
-                    try:
-                        chess_move = test_board.parse_san(move)
-
-                        if chess_move not in test_board.legal_moves:
-                            response += f"\n\n**Variation {var_idx}: {' '.join(variation)}**\n❌ Illegal move: {move} (move {move_num + 1})"
-                            valid = False
-                            break
-
-                        # Make the move
-                        test_board.push(chess_move)
-                        resulting_fen = test_board.fen()
-                        move_fens.append(resulting_fen)
-
-                        # Analyze the resulting position
-                        pos_analysis = analyzer.analyze_position(resulting_fen, depth)
-                        pos_eval = (
-                            pos_analysis["evaluation"]["value"]
-                            if pos_analysis["evaluation"]["type"] == "cp"
-                            else 0
-                        )
-
-                        # Calculate evaluation change
-                        eval_change = pos_eval - current_eval
-                        current_eval = pos_eval
-
-                        move_evaluations.append(
-                            {
-                                "move": move,
-                                "move_number": move_num + 1,
-                                "evaluation": pos_eval,
-                                "eval_change": eval_change,
-                                "fen": resulting_fen,
-                                "analysis": pos_analysis,
-                            }
-                        )
 
-                    except Exception as move_error:
-                        response += f"\n\n**Variation {var_idx}: {' '.join(variation)}**\n❌ Error on move {move}: {str(move_error)}"
-                        valid = False
-                        break
+                for move_num, ((move, _, resulting_fen), pos_analysis) in enumerate(
+                    zip(played["plies"], pos_analyses)
+                ):
+                    pos_eval = (
+                        pos_analysis["evaluation"]["value"]
+                        if pos_analysis["evaluation"]["type"] == "cp"
+                        else 0
+                    )
 
-                if not valid:
-                    continue
+                    # Calculate evaluation change
+                    eval_change = pos_eval - current_eval
+                    current_eval = pos_eval
+
+                    move_evaluations.append(
+                        {
+                            "move": move,
+                            "move_number": move_num + 1,
+                            "evaluation": pos_eval,
+                            "eval_change": eval_change,
+                            "fen": resulting_fen,
+                            "analysis": pos_analysis,
+                        }
+                    )
 
                 # Calculate overall variation assessment
                 final_eval = move_evaluations[-1]["evaluation"]
                 total_change = final_eval - start_eval
 
                 # Determine variation quality
-                if abs(total_change) < 30:
-                    var_quality = "🟢 Balanced"
-                elif total_change > 100:
-                    var_quality = (
-                        "🔵 Good for White"
-                        if board.turn
-                        else "🔵 Good for current player"
-                    )
-                elif total_change < -100:
-                    var_quality = (
-                        "🟡 Good for Black" if board.turn else "🟡 Good for opponent"
-                    )
-                elif abs(total_change) < 100:
-                    var_quality = "🟡 Slight advantage"
-                else:
-                    var_quality = "🔴 Major advantage shift"
+                var_quality = classify_variation(total_change, board.turn)
 
+                moves_text = " ".join(variation)
                 variation_results.append(
                     {
                         "variation": variation,
+                        "moves_text": moves_text,
                         "final_eval": final_eval,
                         "total_change": total_change,
                         "quality": var_quality,
@@ -2252,59 +2522,56 @@ async def analyze_variations(
                 )
 
                 # Format the variation analysis
-                response += (
-                    f"\n\n**Variation {var_idx}: {' '.join(variation)}** {var_quality}"
+                parts.append(f"\n\n**Variation {var_idx}: {moves_text}** {var_quality}")
+                parts.append(
+                    f"\n• Final evaluation: {start_pawns:+.1f} → {final_eval/100:+.1f} (net: {total_change/100:+.1f})"
                 )
-                response += f"\n• Final evaluation: {start_eval/100:+.1f} → {final_eval/100:+.1f} (net: {total_change/100:+.1f})"
-
-                # Show move-by-move progression
-                response += "\n• **Move progression:**"
-                current_display_eval = start_eval
 
-                for i, move_eval in enumerate(move_evaluations):
-                    move_change = move_eval["eval_change"]
+                # Show move-by-move progression; evaluations are from White's
+                # point of view whichever side made the move
+                parts.append("\n• **Move progression:**")
+                previous_pawns = start_pawns
 
-                    # Adjust evaluation display based on whose turn it was
-                    if (i % 2) == 0:  # Move made by starting player
-                        display_eval = move_eval["evaluation"]
-                    else:  # Move made by opponent
-                        display_eval = move_eval["evaluation"]
-
-                    response += f"\n  {i+1}. {move_eval['move']}: {current_display_eval/100:+.1f} → {display_eval/100:+.1f} ({move_change/100:+.1f})"
-                    current_display_eval = display_eval
+                for move_eval in move_evaluations:
+                    pawns = move_eval["evaluation"] / 100
+                    parts.append(
+                        f"\n  {move_eval['move_number']}. {move_eval['move']}: {previous_pawns:+.1f} → {pawns:+.1f} ({move_eval['eval_change']/100:+.1f})"
+                    )
+                    previous_pawns = pawns
 
                 # Show the final position's top moves
                 final_analysis = move_evaluations[-1]["analysis"]
-                response += f"\n• **After variation, best continuation:** {final_analysis['best_move']}"
+                parts.append(
+                    f"\n• **After variation, best continuation:** {final_analysis['best_move']}"
+                )
 
                 # Show final position FEN for further analysis
                 final_fen = move_evaluations[-1]["fen"]
-                response += f"\n• **Final FEN:** `{final_fen}`"
+                parts.append(f"\n• **Final FEN:** `{final_fen}`")
 
             except Exception as var_error:
-                response += f"\n\n**Variation {var_idx}: {' '.join(variation)}**\n❌ Analysis error: {str(var_error)}"
+                parts.append(
+                    f"\n\n**Variation {var_idx}: {' '.join(variation)}**\n❌ Analysis error: {str(var_error)}"
+                )
 
         # Add summary and comparison
         if variation_results:
-            response += "\n\n**📊 Variation Comparison:**"
+            parts.append("\n\n**📊 Variation Comparison:**")
 
             # Sort by final evaluation (from current player's perspective)
-            if board.turn:  # White to move - higher is better
-                sorted_variations = sorted(
-                    variation_results, key=lambda x: x["final_eval"], reverse=True
-                )
-            else:  # Black to move - lower is better
-                sorted_variations = sorted(
-                    variation_results, key=lambda x: x["final_eval"]
-                )
+            # White to move - higher is better; Black to move - lower is better
+            sorted_variations = sorted(
+                variation_results, key=itemgetter("final_eval"), reverse=board.turn
+            )
 
-            response += f"\n\n**Best to Worst (for {to_move}):**"
+            parts.append(f"\n\n**Best to Worst (for {to_move}):**")
             for i, var_result in enumerate(sorted_variations[:8], 1):
-                var_moves = " ".join(var_result["variation"])
-                response += f"\n{i}. **{var_moves}** ({var_result['final_eval']/100:+.1f}, {var_result['total_change']/100:+.1f})"
+                parts.append(
+                    f"\n{i}. **{var_result['moves_text']}** ({var_result['final_eval']/100:+.1f}, {var_result['total_change']/100:+.1f})"
+                )
 
             # Strategic insights
-            response += "\n\n**🧠 Strategic Insights:**"
+            parts.append("\n\n**🧠 Strategic Insights:**")
 
             best_var = sorted_variations[0]
             worst_var = sorted_variations[-1] if len(sorted_variations) > 1 else None
@@ -2315,46 +2582,74 @@ async def analyze_variations(
             )
 
             if eval_diff > 200:
-                response += f"\n• **Major difference** between variations ({eval_diff/100:.1f} pawns) - choice is critical"
+                parts.append(
+                    f"\n• **Major difference** between variations ({eval_diff/100:.1f} pawns) - choice is critical"
+                )
             elif eval_diff > 100:
-                response += "\n• **Significant difference** between variations - careful evaluation needed"
+                parts.append(
+                    "\n• **Significant difference** between variations - careful evaluation needed"
+                )
             else:
-                response += "\n• **Similar outcomes** - multiple good options available"
+                parts.append(
+                    "\n• **Similar outcomes** - multiple good options available"
+                )
 
-            # Identify patterns
-            forcing_variations = sum(
-                1
-                for var in variation_results
-                if any("x" in move or "+" in move for move in var["variation"])
-            )
+            # Identify patterns; a variation is forcing if any of its SAN moves
+            # is a capture or check, so each one is scanned as a single string
+            forcing_variations = 0
+            for var in variation_results:
+                moves_text = var["moves_text"]
+                if "x" in moves_text or "+" in moves_text:
+                    forcing_variations += 1
             if forcing_variations > 0:
-                response += f"\n• **{forcing_variations} variation(s)** contain forcing moves (captures/checks)"
+                parts.append(
+                    f"\n• **{forcing_variations} variation(s)** contain forcing moves (captures/checks)"
+                )
 
             # Opening vs tactical nature
             if len(variation_results[0]["variation"]) <= 3 and all(
                 abs(var["total_change"]) < 150 for var in variation_results
             ):
-                response += (
+                parts.append(
                     "\n• **Positional variations** - focus on development and structure"
                 )
             elif any(abs(var["total_change"]) > 200 for var in variation_results):
-                response += (
+                parts.append(
                     "\n• **Tactical variations** - concrete calculation is essential"
                 )
 
-        response += "\n\n**💡 Multi-Move Analysis Benefits:**"
-        response += "\n• See how plans develop over multiple moves"
-        response += "\n• Compare strategic vs tactical approaches"
-        response += "\n• Understand position transformation patterns"
-        response += "\n• Use final FENs for deeper analysis if needed"
+        parts.append("""
+
+**💡 Multi-Move Analysis Benefits:**
+• See how plans develop over multiple moves
+• Compare strategic vs tactical approaches
+• Understand position transformation patterns
+• Use final FENs for deeper analysis if needed""")
 
-        response += f"\n\n*Analyzed {len(variations)} variation(s) at depth {depth}*"
+        parts.append(f"\n\n*Analyzed {len(variations)} variation(s) at depth {depth}*")
 
-        return [TextContent(type="text", text=response)]
+        return [TextContent(type="text", text="".join(parts))]
 
     except Exception as e:
         return [TextContent(type="text", text=f"❌ Variation analysis error: {str(e)}")]
 
 
+# Tool name to handler, so a call is a single lookup instead of a string chain
+TOOL_HANDLERS = {
+    "analyze_position": analyze_position_comprehensive,
+    "evaluate_move": evaluate_specific_move,
+    "find_tactics": find_tactical_opportunities,
+    "opening_analysis": analyze_opening_position,
+    "endgame_guidance": provide_endgame_guidance,
+    "explore_moves": explore_candidate_moves,
+    "analyze_variations": analyze_variations,
+    "apply_moves": apply_moves_to_fen,
+    "show_engine_line": show_engine_main_line,
+    "analyze_chess_concepts": analyze_chess_concepts,
+    "visualize_board": visualize_board_position,
+    "list_legal_moves": list_legal_moves,
+}
+
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -5,6 +5,28 @@ import chess
 from typing import List, Dict, Any
 from mcp.types import TextContent
 
+# Board glyphs by piece symbol: White pieces use the filled glyphs
+PIECE_GLYPHS = {
+    "P": "♟",
+    "R": "♜",
+    "N": "♞",
+    "B": "♝",
+    "Q": "♛",
+    "K": "♚",
+    "p": "♙",
+    "r": "♖",
+    "n": "♘",
+    "b": "♗",
+    "q": "♕",
+    "k": "♔",
+}
+
+# Two-character board cells, indexed by whether the square is highlighted
+PIECE_CELLS = {
+    symbol: (f"{glyph} ", f"[{glyph}") for symbol, glyph in PIECE_GLYPHS.items()
+}
+EMPTY_CELLS = ("  ", "██")
+
 
 def generate_ascii_board(
     board: chess.Board,
@@ -26,15 +48,9 @@ def generate_ascii_board(
     if highlight_pieces is None:
         highlight_pieces = []
 
-    # Define piece symbols
-    piece_symbols = {
-        chess.PAWN: ("♟", "♙"),
-        chess.ROOK: ("♜", "♖"),
-        chess.KNIGHT: ("♞", "♘"),
-        chess.BISHOP: ("♝", "♗"),
-        chess.QUEEN: ("♛", "♕"),
-        chess.KING: ("♚", "♔"),
-    }
+    # Look pieces up in one snapshot instead of probing every square
+    pieces = board.piece_map()
+    highlighted = set(highlight_pieces)
 
     # Build the board string
     board_lines = []
@@ -57,25 +73,15 @@ def generate_ascii_board(
         files = range(7, -1, -1) if flip else range(8)
         for file in files:
             square = chess.square(file, rank)
-            piece = board.piece_at(square)
-            square_name = chess.square_name(square)
+            piece = pieces.get(square)
 
             # Check if this square should be highlighted
-            is_highlighted = square_name in highlight_pieces
+            is_highlighted = chess.SQUARE_NAMES[square] in highlighted
 
             if piece is None:
-                # Empty square
-                if is_highlighted:
-                    line += "██"  # Highlighted empty square
-                else:
-                    line += "  "  # Normal empty square
+                line += EMPTY_CELLS[is_highlighted]
             else:
-                # Piece on square
-                symbol = piece_symbols[piece.piece_type][0 if piece.color else 1]
-                if is_highlighted:
-                    line += f"[{symbol}]"[0:2]  # Highlight piece (truncate to 2 chars)
-                else:
-                    line += f"{symbol} "
+                line += PIECE_CELLS[piece.symbol()][is_highlighted]
 
             line += "│"
 
@@ -128,7 +134,7 @@ def get_position_info(fen: str) -> Dict[str, Any]:
             "turn": "White" if board.turn else "Black",
             "castling_rights": "".join(castling_rights) if castling_rights else "None",
             "en_passant": (
-                chess.square_name(board.ep_square) if board.ep_square else "None"
+                chess.SQUARE_NAMES[board.ep_square] if board.ep_square else "None"
             ),
             "halfmove_clock": board.halfmove_clock,
             "fullmove_number": board.fullmove_number,
@@ -730,7 +730,7 @@ class MCPToolRouter:
 
             # Count pieces to determine if it's an endgame
             board = chess.Board(fen)
-            piece_count = len([p for p in board.piece_map().values()])
+            piece_count = chess.popcount(board.occupied)
 
             if piece_count > 12:
                 return [
@@ -799,16 +799,11 @@ class MCPToolRouter:
                 formatted_response += "\n• King activity is crucial in simple endgames"
                 formatted_response += "\n• Centralize your king when possible"
 
-            if any(
-                piece.piece_type == chess.PAWN for piece in board.piece_map().values()
-            ):
+            if board.pawns:
                 formatted_response += "\n• Push passed pawns when safe"
                 formatted_response += "\n• Use your king to support pawn advancement"
 
-            if any(
-                piece.piece_type in [chess.ROOK, chess.QUEEN]
-                for piece in board.piece_map().values()
-            ):
+            if board.rooks | board.queens:
                 formatted_response += "\n• Keep heavy pieces active"
                 formatted_response += "\n• Cut off the enemy king when possible"
 